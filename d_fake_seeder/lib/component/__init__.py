@@ -0,0 +1,6 @@
+import gi
+
+# Pin the GTK versions once for every component module, the package runs
+# this before any of them is imported
+gi.require_version("Gdk", "4.0")
+gi.require_version("Gtk", "4.0")
@@ -1,6 +1,6 @@
-from abc import ABC, abstractmethod
+from abc import ABC
 
-from lib.logger import logger
+from lib.logger import DEBUG_ENABLED, logger
 
 
 class Component(ABC):
@@ -8,33 +8,33 @@ class Component(ABC):
     def to_str(bind, from_value):
         return str(from_value)
 
-    @abstractmethod
+    # Default handlers only log, components override the signals they use
     def handle_model_changed(self, source, data_obj, data_changed):
-        logger.debug(
-            "Component Model changed",
-            extra={"class_name": self.__class__.__name__},
-        )
+        if DEBUG_ENABLED:
+            logger.debug(
+                "Component Model changed",
+                extra={"class_name": self.__class__.__name__},
+            )
 
-    @abstractmethod
     def handle_attribute_changed(self, source, key, value):
-        logger.debug(
-            "Component Attribute changed",
-            extra={"class_name": self.__class__.__name__},
-        )
+        if DEBUG_ENABLED:
+            logger.debug(
+                "Component Attribute changed",
+                extra={"class_name": self.__class__.__name__},
+            )
 
-    @abstractmethod
     def handle_settings_changed(self, source, data_obj, data_changed):
         logger.debug(
             "Component settings changed",
             extra={"class_name": self.__class__.__name__},
         )
 
-    @abstractmethod
     def update_view(self, model, torrent, attribute):
-        logger.debug(
-            "Component update view",
-            extra={"class_name": self.__class__.__name__},
-        )
+        if DEBUG_ENABLED:
+            logger.debug(
+                "Component update view",
+                extra={"class_name": self.__class__.__name__},
+            )
 
     def set_model(self, model):
         self.model = model
@@ -1,19 +1,67 @@
 import logging
+import threading
+from contextlib import contextmanager
+from typing import NamedTuple, Optional
 
-import gi
+from gi.repository import Gio, GLib, GObject, Gtk, Pango
 from lib.component.component import Component
-from lib.logger import logger
+from lib.logger import DEBUG_ENABLED, logger
 from lib.settings import Settings
-from lib.torrent.model.attributes import Attributes
+from lib.torrent.model.attributes import ATTRIBUTE_NAMES
+from lib.torrent.model.torrent_file import TorrentFile
 from lib.torrent.model.torrent_peer import TorrentPeer
 
-gi.require_version("Gdk", "4.0")
-gi.require_version("Gtk", "4.0")
 
-from gi.repository import Gio, GLib, GObject, Gtk  # noqa
+class OptionKind(NamedTuple):
+    # Widget class, change signal and the Notebook methods that set up, load
+    # and handle the option widget
+    widget_class: type
+    signal: str
+    setup: Optional[str]
+    load: str
+    make_handler: str
 
 
 class Notebook(Component):
+    # Logging extra for the refresh path, built once rather than per call
+    LOG_EXTRA = {"class_name": "Notebook"}
+
+    TAB_NAMES = (
+        "status_tab",
+        "files_tab",
+        "details_tab",
+        "options_tab",
+        "peers_tab",
+        "trackers_tab",
+        "log_tab",
+    )
+
+    # Tabs showing the selected torrent and the method filling each of them
+    TAB_UPDATERS = (
+        ("status_tab", "update_notebook_status"),
+        ("options_tab", "update_notebook_options"),
+        ("peers_tab", "update_notebook_peers"),
+        ("files_tab", "update_notebook_files"),
+    )
+
+    # How each option widget type used in the editwidgets setting is wired up
+    OPTION_KINDS = {
+        "Gtk.Switch": OptionKind(
+            Gtk.Switch,
+            "state-set",
+            None,
+            "load_switch_value",
+            "make_switch_handler",
+        ),
+        "Gtk.SpinButton": OptionKind(
+            Gtk.SpinButton,
+            "value-changed",
+            "setup_spin_widget",
+            "load_spin_value",
+            "make_spin_handler",
+        ),
+    }
+
     def __init__(self, builder, model):
         logger.info(
             "Notebook view startup",
@@ -26,9 +74,13 @@ class Notebook(Component):
         self.peers_columnview = self.builder.get_object("peers_columnview")
         self.log_scroll = self.builder.get_object("log_scroll")
         self.log_viewer = self.builder.get_object("log_viewer")
+        self.status_tab = self.builder.get_object("status_tab")
+        self.files_tab = self.builder.get_object("files_tab")
+        self.options_grid = self.builder.get_object("options_grid")
 
         self.setup_log_viewer_handler()
-        self.init_peers_column_view()
+        # The peers columns are built the first time the peers tab is filled
+        self.peers_store = None
 
         # subscribe to settings changed
         self.settings = Settings.get_instance()
@@ -36,20 +88,26 @@ class Notebook(Component):
 
         # tab children
         self.status_grid_child = None
-        self.files_grid_child = None
-        self.options_grid_children = []
-
-        tab_names = [
-            "status_tab",
-            "files_tab",
-            "details_tab",
-            "options_tab",
-            "peers_tab",
-            "trackers_tab",
-            "log_tab",
+        self.status_value_labels = []
+        # The files columnview is built the first time the files tab is filled
+        self.files_store = None
+        self.files_torrent = None
+        self.options_torrent = None
+        # option widgets, change handler ids and loaders, keyed by attribute
+        self.options_widgets = {}
+
+        # pending debounced writes, keyed by (torrent, attribute)
+        self.debounce_sources = {}
+
+        # Only the visible tab is filled in, the others catch up on switch-page
+        self.selected_torrent = None
+        self.tab_updaters = [
+            (self.builder.get_object(tab_name), getattr(self, updater))
+            for tab_name, updater in self.TAB_UPDATERS
         ]
+        self.notebook.connect("switch-page", self.on_switch_page)
 
-        for tab_name in tab_names:
+        for tab_name in self.TAB_NAMES:
             tab = self.builder.get_object(tab_name)
             tab.set_visible(True)
             tab.set_margin_top(10)
@@ -58,9 +116,23 @@ class Notebook(Component):
             tab.set_margin_end(10)
 
     def setup_log_viewer_handler(self):
+        # The log view keeps one buffer for its lifetime, fetch it once
+        self.log_buffer = self.log_viewer.get_buffer()
+
+        # Records from any thread queue up here, a single idle callback at a
+        # time flushes them into the buffer
+        self.log_lock = threading.Lock()
+        self.log_pending = []
+        self.log_flush_scheduled = False
+
         def update_textview(record):
             msg = f"{record.levelname}: {record.getMessage()}\n"
-            GLib.idle_add(lambda: self.update_text_buffer(self.log_viewer, msg))
+            with self.log_lock:
+                self.log_pending.append(msg)
+                if self.log_flush_scheduled:
+                    return
+                self.log_flush_scheduled = True
+            GLib.idle_add(self.flush_log_buffer)
 
         handler = logging.StreamHandler()
         handler.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
@@ -70,12 +142,18 @@ class Notebook(Component):
         logger = logging.getLogger()
         logger.addHandler(handler)
 
-    def update_text_buffer(self, text_view, msg):
-        buffer = text_view.get_buffer()
+    def flush_log_buffer(self):
+        with self.log_lock:
+            pending = self.log_pending
+            self.log_pending = []
+            self.log_flush_scheduled = False
+        self.update_text_buffer(self.log_buffer, "".join(pending))
+        return False
+
+    def update_text_buffer(self, buffer, msg):
         buffer.insert_at_cursor(msg)
 
-        _, end_iter = buffer.get_bounds()
-        end_line = end_iter.get_line()
+        end_line = buffer.get_line_count() - 1
         if end_line > 1000:
             start_iter = buffer.get_start_iter()
             start_iter.set_line(end_line - 1000)
@@ -124,30 +202,27 @@ class Notebook(Component):
         self.peers_columnview.set_model(self.selection)
 
     def update_notebook_peers(self, torrent):
-        logger.info(
-            "Notebook update peers",
-            extra={"class_name": self.__class__.__name__},
-        )
+        if DEBUG_ENABLED:
+            logger.debug("Notebook update peers", extra=self.LOG_EXTRA)
 
-        torrent = next(
-            (item for item in self.model.get_torrents() if item.id == torrent.id),
-            None,
-        )
+        if self.peers_store is None:
+            self.init_peers_column_view()
+
+        torrent = self.model.get_torrent_by_id(torrent.id)
 
         num_rows = len(self.peers_columnview.get_model())
         num_peers = len(torrent.get_seeder().peers)
 
         if num_rows != num_peers:
-            self.peers_store.remove_all()
-
-            for peer in torrent.get_seeder().peers:
-                client = (
-                    torrent.get_seeder().clients[peer]
-                    if peer in torrent.get_seeder().clients
-                    else ""
-                )
-                row = TorrentPeer(str(peer), client, 0.0, 0.0, 0.0)
-                self.peers_store.append(row)
+            # Build the rows first and swap them in with one splice, the view
+            # then sees a single items-changed instead of one per peer
+            seeder = torrent.get_seeder()
+            clients = seeder.clients
+            rows = [
+                TorrentPeer(str(peer), clients.get(peer, ""), 0.0, 0.0, 0.0)
+                for peer in seeder.peers
+            ]
+            self.peers_store.splice(0, self.peers_store.get_n_items(), rows)
 
             self.peers_columnview.set_model(self.selection)
 
@@ -193,179 +268,236 @@ class Notebook(Component):
         GLib.idle_add(bind_when_idle)
 
     def update_notebook_options(self, torrent):
-        grid = self.builder.get_object("options_grid")
-
-        for child in self.options_grid_children:
-            grid.remove(child)
-            child.unparent()
-        self.options_grid_children = []
-
-        def on_value_changed(widget, *args):
-            attribute = args[-1]
-            if isinstance(widget, Gtk.Switch):
-                value = widget.get_active()
-            else:
-                adjustment = widget.get_adjustment()
-                value = adjustment.get_value()
-            setattr(torrent, attribute, value)
+        self.options_torrent = torrent
+
+        # The option widgets are created once and reused for every selection
+        if not self.options_widgets:
+            self.create_options_widgets()
+
+        # Load the selected torrent's values with the change handlers blocked,
+        # re-populating the widgets must not write the values back
+        with self.options_handlers_blocked():
+            for attribute, (widget, _, load) in self.options_widgets.items():
+                load(widget, getattr(torrent, attribute))
+
+    @contextmanager
+    def options_handlers_blocked(self):
+        widgets = self.options_widgets.values()
+        for widget, handler_id, _ in widgets:
+            widget.handler_block(handler_id)
+        try:
+            yield
+        finally:
+            for widget, handler_id, _ in widgets:
+                widget.handler_unblock(handler_id)
+
+    def create_options_widgets(self):
+        grid = self.options_grid
 
         row = 0
         for index, attribute in enumerate(self.settings.editwidgets):
             col = 0 if index % 2 == 0 else 2
 
             widget_type = self.settings.editwidgets[attribute]
-            widget_class = eval(widget_type)
-            dynamic_widget = widget_class()
-            dynamic_widget.set_visible(True)
+            kind = self.OPTION_KINDS[widget_type]
+            dynamic_widget = kind.widget_class()
             dynamic_widget.set_hexpand(True)
-            if isinstance(dynamic_widget, Gtk.Switch):
-                dynamic_widget.set_active(getattr(torrent, attribute))
-                # Connect "state-set" signal for Gtk.Switch
-                dynamic_widget.connect("state-set", on_value_changed, attribute)
-            else:
-                adjustment = Gtk.Adjustment(
-                    value=getattr(torrent, attribute),
-                    upper=getattr(torrent, attribute) * 10,
-                    lower=0,
-                    step_increment=1,
-                    page_increment=10,
-                )
-                dynamic_widget.set_adjustment(adjustment)
-                dynamic_widget.set_wrap(True)
-                # Connect "value-changed" signal for other widgets
-                dynamic_widget.connect(
-                    "value-changed", on_value_changed, adjustment, attribute
-                )
+            if kind.setup is not None:
+                getattr(self, kind.setup)(dynamic_widget)
+            handler_id = dynamic_widget.connect(
+                kind.signal, getattr(self, kind.make_handler)(attribute)
+            )
 
             label = Gtk.Label()
             label.set_text(attribute)
             label.set_name(f"label_{attribute}")
-            label.set_visible(True)
             label.set_hexpand(True)
 
             grid.attach(label, col, row, 1, 1)
             grid.attach(dynamic_widget, col + 1, row, 1, 1)
-            self.options_grid_children.append(label)
-            self.options_grid_children.append(dynamic_widget)
+            self.options_widgets[attribute] = (
+                dynamic_widget,
+                handler_id,
+                getattr(self, kind.load),
+            )
 
             if col == 2:
                 row += 1
 
-    def update_notebook_status(self, torrent):
-        logger.info(
-            "Notebook update status",
-            extra={"class_name": self.__class__.__name__},
+    def setup_spin_widget(self, widget):
+        adjustment = Gtk.Adjustment(
+            lower=0,
+            step_increment=1,
+            page_increment=10,
         )
+        widget.set_adjustment(adjustment)
+        widget.set_wrap(True)
+
+    def load_switch_value(self, widget, value):
+        widget.set_active(value)
+
+    def load_spin_value(self, widget, value):
+        widget.get_adjustment().configure(value, 0, value * 10, 1, 10, 0)
+
+    def apply_option_value(self, torrent, attribute, value):
+        # Signals re-fire with the current value on programmatic updates,
+        # only write real changes so bound views are not notified
+        if getattr(torrent, attribute) == value:
+            return
+        setattr(torrent, attribute, value)
+
+    # Each widget gets its own handler bound to its attribute at connect
+    # time, so the handlers need no type checks or argument unpacking
+    def make_switch_handler(self, attribute):
+        def on_switch_changed(widget, state):
+            self.apply_option_value(self.options_torrent, attribute, state)
+
+        return on_switch_changed
+
+    def make_spin_handler(self, attribute):
+        def on_spin_changed(widget):
+            # Holding an arrow or scrolling emits a value-changed per
+            # step, write only the value the spin button settles on
+            torrent = self.options_torrent
+            self.debounce(
+                (torrent, attribute),
+                200,
+                self.apply_option_value,
+                torrent,
+                attribute,
+                widget.get_value(),
+            )
+
+        return on_spin_changed
+
+    def debounce(self, key, delay_ms, func, *args):
+        source_id = self.debounce_sources.pop(key, None)
+        if source_id is not None:
+            GLib.source_remove(source_id)
+
+        def fire():
+            self.debounce_sources.pop(key, None)
+            func(*args)
+            return False
 
-        if self.status_grid_child is not None:
-            self.status_tab.remove(self.status_grid_child)
-            self.status_grid_child.unparent()
+        self.debounce_sources[key] = GLib.timeout_add(delay_ms, fire)
 
-        self.status_grid_child = Gtk.Grid()
-        self.status_grid_child.set_column_spacing(10)
+    def init_status_rows(self):
+        # A column of plain boxes, the fixed width name labels line the values
+        # up without the grid's extra measuring pass
+        self.status_grid_child = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
         self.status_grid_child.set_hexpand(True)
         self.status_grid_child.set_vexpand(True)
-        self.status_grid_child.set_visible(True)
 
-        ATTRIBUTES = Attributes
-        compatible_attributes = [
-            prop.name.replace("-", "_") for prop in GObject.list_properties(ATTRIBUTES)
-        ]
-
-        # Create columns and add them to the TreeView
-        for attribute_index, attribute in enumerate(compatible_attributes):
-            row = attribute_index
+        for attribute in ATTRIBUTE_NAMES:
+            row = Gtk.Box(spacing=10)
 
             labeln = Gtk.Label(label=attribute, xalign=0)
-            labeln.set_visible(True)
             # labeln.set_margin_left(10)
             labeln.set_halign(Gtk.Align.START)
-            labeln.set_size_request(80, -1)
-            self.status_grid_child.attach(labeln, 0, row, 1, 1)
+            labeln.set_size_request(280, -1)
+            row.append(labeln)
 
-            val = torrent.get_property(attribute)
-            labelv = Gtk.Label(label=val, xalign=0)
-            labelv.set_visible(True)
+            labelv = Gtk.Label(xalign=0)
             # labelv.set_margin_left(10)
             labelv.set_halign(Gtk.Align.START)
-            labeln.set_size_request(280, -1)
             labelv.set_selectable(True)  # Enable text selection
-            self.status_grid_child.attach(labelv, 1, row, 1, 1)
+            labelv.set_ellipsize(Pango.EllipsizeMode.END)
+            labelv.set_max_width_chars(64)
+            row.append(labelv)
+            self.status_value_labels.append(labelv)
 
-        self.status_tab = self.builder.get_object("status_tab")
-        self.status_tab.append(self.status_grid_child)
+            self.status_grid_child.append(row)
 
-    def update_notebook_files(self, torrent):
-        logger.info(
-            "Notebook update files",
-            extra={"class_name": self.__class__.__name__},
-        )
+        self.status_tab.append(self.status_grid_child)
 
-        if self.files_grid_child is not None:
-            self.status_tab.remove(self.files_grid_child)
-            self.files_grid_child.unparent()
+    def update_notebook_status(self, torrent):
+        if DEBUG_ENABLED:
+            logger.debug("Notebook update status", extra=self.LOG_EXTRA)
 
-        self.files_grid_child = Gtk.Grid()
-        self.files_grid_child.set_column_spacing(10)
-        self.files_grid_child.set_hexpand(True)
-        self.files_grid_child.set_vexpand(True)
-        self.files_grid_child.set_visible(True)
+        # The rows are built once, later updates only relabel the values
+        if self.status_grid_child is None:
+            self.init_status_rows()
 
-        files = self.model.get_torrents()
-        filtered_torrent = next((t for t in files if t.id == torrent.id), None)
+        # Read every value in one call and walk labels and values together
+        values = torrent.get_properties(*ATTRIBUTE_NAMES)
+        for labelv, val in zip(self.status_value_labels, values):
+            text = str(val)
+            if labelv.get_label() != text:
+                labelv.set_label(text)
 
-        # Create columns and add them to the TreeView
-        for attribute_index, (fullpath, length) in enumerate(
-            filtered_torrent.get_torrent_file().get_files()
-        ):
-            row = attribute_index
+    def init_files_column_view(self):
+        logger.info(
+            "Notebook init files columnview",
+            extra={"class_name": self.__class__.__name__},
+        )
 
-            labeln = Gtk.Label(label=fullpath, xalign=0)
-            labeln.set_visible(True)
-            labeln.set_halign(Gtk.Align.START)
-            labeln.set_size_request(80, -1)
-            self.files_grid_child.attach(labeln, 0, row, 1, 1)
+        self.files_store = Gio.ListStore.new(TorrentFile)
+        files_columnview = Gtk.ColumnView.new(Gtk.NoSelection.new(self.files_store))
 
-            labelv = Gtk.Label(label=length, xalign=0)
-            labelv.set_visible(True)
-            labelv.set_halign(Gtk.Align.START)
-            labelv.set_size_request(280, -1)
-            labelv.set_selectable(True)  # Enable text selection
-            self.files_grid_child.attach(labelv, 1, row, 1, 1)
+        for property_name in ("path", "size"):
+            factory = Gtk.SignalListItemFactory()
+            factory.connect("setup", self.setup_file_label)
+            factory.connect("bind", self.bind_file_label, property_name)
+            column = Gtk.ColumnViewColumn.new(property_name, factory)
+            column.set_expand(property_name == "path")
+            files_columnview.append_column(column)
+
+        scrolled_window = Gtk.ScrolledWindow()
+        scrolled_window.set_hexpand(True)
+        scrolled_window.set_vexpand(True)
+        scrolled_window.set_child(files_columnview)
+        self.files_tab.append(scrolled_window)
+
+    def setup_file_label(self, factory, item):
+        label = Gtk.Label(xalign=0)
+        label.set_selectable(True)  # Enable text selection
+        # Deep paths are cut at a fixed width instead of widening the column
+        label.set_ellipsize(Pango.EllipsizeMode.END)
+        label.set_max_width_chars(64)
+        item.set_child(label)
+
+    def bind_file_label(self, factory, item, property_name):
+        item.get_child().set_label(item.get_item().get_property(property_name))
 
-        self.files_tab = self.builder.get_object("files_tab")
-        self.files_tab.append(self.files_grid_child)
+    def update_notebook_files(self, torrent):
+        if DEBUG_ENABLED:
+            logger.debug("Notebook update files", extra=self.LOG_EXTRA)
 
-    def update_view(self, model, torrent, attribute):
-        pass
+        if self.files_store is None:
+            self.init_files_column_view()
 
-    def handle_settings_changed(self, source, key, value):
-        logger.debug(
-            "Torrents view settings changed",
-            extra={"class_name": self.__class__.__name__},
-        )
-        # print(key + " = " + value)
+        filtered_torrent = self.model.get_torrent_by_id(torrent.id)
 
-    def handle_model_changed(self, source, data_obj, data_changed):
-        logger.info(
-            "Notebook settings changed",
-            extra={"class_name": self.__class__.__name__},
-        )
-        # print(key + " = " + value)
+        # A torrent's file list never changes, refreshes for the torrent
+        # already shown leave the rows alone
+        if filtered_torrent is self.files_torrent:
+            return
+        self.files_torrent = filtered_torrent
 
-    def handle_attribute_changed(self, source, key, value):
-        logger.debug(
-            "Attribute changed",
-            extra={"class_name": self.__class__.__name__},
-        )
+        # Swap the rows in one splice, the columnview only realizes the rows
+        # that are on screen
+        rows = [
+            TorrentFile(fullpath, length)
+            for fullpath, length in filtered_torrent.get_torrent_file().get_files()
+        ]
+        self.files_store.splice(0, self.files_store.get_n_items(), rows)
 
     def model_selection_changed(self, source, model, torrent):
-        logger.debug(
-            "Model selection changed",
-            extra={"class_name": self.__class__.__name__},
-        )
+        if DEBUG_ENABLED:
+            logger.debug("Model selection changed", extra=self.LOG_EXTRA)
         if torrent is not None:
-            self.update_notebook_status(torrent)
-            self.update_notebook_options(torrent)
-            self.update_notebook_peers(torrent)
-            self.update_notebook_files(torrent)
+            self.selected_torrent = torrent
+            notebook = self.notebook
+            self.update_notebook_page(notebook.get_nth_page(notebook.get_current_page()))
+
+    def on_switch_page(self, notebook, page, page_num):
+        if self.selected_torrent is not None:
+            self.update_notebook_page(page)
+
+    def update_notebook_page(self, page):
+        # Tabs may be wrapped in a scrolled window, match the page that holds them
+        for tab, updater in self.tab_updaters:
+            if tab == page or tab.is_ancestor(page):
+                updater(self.selected_torrent)
+                break
@@ -1,15 +1,40 @@
-import gi
+from gi.repository import Gio, GLib, Gtk
 from lib.component.component import Component
-from lib.logger import logger
 from lib.settings import Settings
-
-gi.require_version("Gdk", "4.0")
-gi.require_version("Gtk", "4.0")
-
-from gi.repository import Gtk  # noqa
+from lib.torrent.model.torrentstate import TorrentState
+from lib.util import deferred_init
+
+# List item template binding a label to a TorrentState property, GTK evaluates
+# the expression itself so no Python runs per row
+LABEL_ITEM_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<interface>
+  <template class="GtkListItem">
+    <property name="child">
+      <object class="GtkLabel">
+        <property name="halign">start</property>
+        <binding name="label">
+          <lookup name="%s" type="TorrentState">
+            <lookup name="item">GtkListItem</lookup>
+          </lookup>
+        </binding>
+      </object>
+    </property>
+  </template>
+</interface>
+"""
+
+
+def label_item_factory(property_name):
+    template = LABEL_ITEM_TEMPLATE % property_name
+    return Gtk.BuilderListItemFactory.new_from_bytes(
+        None, GLib.Bytes.new(template.encode())
+    )
 
 
 class States(Component):
+    # Tracker counts are refreshed every this many ticks
+    TICK_REFRESH_FACTOR = 5
+
     def __init__(self, builder, model):
         self.builder = builder
         self.model = model
@@ -20,85 +45,84 @@ class States(Component):
 
         self.states_columnview = self.builder.get_object("states_columnview")
 
-        # Initialize columns
-        self.create_columns()
+        # One store for the life of the view, updates are applied to its rows
+        self.trackers_store = Gio.ListStore.new(TorrentState)
+        # store rows keyed by tracker hostname
+        self.tracker_rows = {}
+        # pending slow tick timer and immediate idle refresh, 0 when unset
+        self.tick_source = 0
+        self.idle_source = 0
+        self.states_columnview.set_model(Gtk.SingleSelection.new(self.trackers_store))
+
+        # Initialize columns once the window is painted, the sidebar is
+        # secondary and appending columns later is safe on a populated view
+        deferred_init.schedule(self.create_columns)
 
     def create_columns(self):
         # Create the column for the tracker name
         tracker_col = Gtk.ColumnViewColumn()
         tracker_col.set_title("Tracker")
-        tracker_col.set_visible(True)  # Set column visibility
         tracker_col.set_expand(True)
 
-        # Create a custom factory for the tracker column
-        tracker_factory = Gtk.SignalListItemFactory()
-        tracker_factory.connect("setup", self.setup_tracker_factory)
-        tracker_factory.connect("bind", self.bind_tracker_factory)
-        tracker_col.set_factory(tracker_factory)
+        # Bind the tracker label straight to the row's property
+        tracker_col.set_factory(label_item_factory("tracker"))
 
         self.states_columnview.append_column(tracker_col)
 
         # Create the column for the count
         count_col = Gtk.ColumnViewColumn()
         count_col.set_title("#")
-        count_col.set_visible(True)  # Set column visibility
 
-        # Create a custom factory for the count column
-        count_factory = Gtk.SignalListItemFactory()
-        count_factory.connect("setup", self.setup_count_factory)
-        count_factory.connect("bind", self.bind_count_factory)
-        count_col.set_factory(count_factory)
+        # Bind the count label straight to the row's property
+        count_col.set_factory(label_item_factory("count"))
 
         self.states_columnview.append_column(count_col)
 
-    def setup_tracker_factory(self, factory, item):
-        item.set_child(Gtk.Label(halign=Gtk.Align.START))
-
-    def bind_tracker_factory(self, factory, item):
-        # Get the item from the factory
-        torrent_state = item.get_item()
-
-        # Update the label with the tracker data
-        value = torrent_state.tracker if torrent_state.tracker is not None else ""
-        item.get_child().set_label(value)
-
-    def setup_count_factory(self, factory, item):
-        item.set_child(Gtk.Label(halign=Gtk.Align.START))
-
-    def bind_count_factory(self, factory, item):
-        # Get the item from the factory
-        torrent_state = item.get_item()
-
-        # Update the label with the count data
-        item.get_child().set_label(str(torrent_state.count))
-
     # Method to update the ColumnView with compatible attributes
     def update_view(self, model, torrent, attribute):
-        selection_model = Gtk.SingleSelection.new(model.get_trackers_liststore())
-        self.states_columnview.set_model(selection_model)
-
-    def handle_settings_changed(self, source, key, value):
-        logger.debug(
-            "Torrents view settings changed",
-            extra={"class_name": self.__class__.__name__},
-        )
-        # print(key + " = " + value)
-
-    def handle_model_changed(self, source, data_obj, data_changed):
-        logger.debug(
-            "States settings update",
-            extra={"class_name": self.__class__.__name__},
-        )
-        # print(key + " = " + value)
-
-    def handle_attribute_changed(self, source, key, value):
-        logger.debug(
-            "Attribute changed",
-            extra={"class_name": self.__class__.__name__},
-        )
-
-    def model_selection_changed(self, source, model, torrent):
-        logger.debug(
-            "Model selection changed",
-            extra={"class_name": self.__class__.__name__},
-        )
+        # Every torrent ticks on its own, recount once per burst rather than
+        # walking all torrents for each of their signals
+        if self.idle_source:
+            return
+        if attribute == "attribute":
+            if self.tick_source:
+                return
+            # Tracker counts rarely move between ticks, follow them at a
+            # slower cadence than the per tick views
+            interval = int(self.settings.tickspeed * self.TICK_REFRESH_FACTOR)
+            self.tick_source = GLib.timeout_add_seconds(
+                max(interval, 1), self.refresh_trackers, model
+            )
+        else:
+            # Torrents added or removed show up straight away, the idle
+            # refresh covers any tick still waiting on the slow timer
+            if self.tick_source:
+                GLib.source_remove(self.tick_source)
+                self.tick_source = 0
+            self.idle_source = GLib.idle_add(self.refresh_trackers, model)
+
+    def refresh_trackers(self, model):
+        self.tick_source = 0
+        self.idle_source = 0
+
+        # Diff the counts against the shown rows, only changed counts notify
+        # and the selection survives the update
+        tracker_count = model.get_tracker_counts()
+        store = self.trackers_store
+        tracker_rows = self.tracker_rows
+
+        for fqdn in [fqdn for fqdn in tracker_rows if fqdn not in tracker_count]:
+            found, position = store.find(tracker_rows.pop(fqdn))
+            if found:
+                store.remove(position)
+
+        for fqdn, count in tracker_count.items():
+            row = tracker_rows.get(fqdn)
+            if row is None:
+                row = TorrentState(fqdn, count)
+                tracker_rows[fqdn] = row
+                store.append(row)
+            elif row.count != count:
+                row.count = count
+
+        return False
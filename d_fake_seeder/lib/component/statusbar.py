@@ -1,13 +1,41 @@
+import ipaddress
+import threading
 import time
 
 import requests
+from gi.repository import GLib
 from lib.component.component import Component
-from lib.logger import logger
+from lib.logger import DEBUG_ENABLED, logger
 from lib.settings import Settings
 from lib.util.helpers import humanbytes
 
+# Label templates, formatted once per label and tick
+SPEED_TEXT = " %s /s"
+AMOUNT_TEXT = "  %s / %s"
+
 
 class Statusbar(Component):
+    # Speed label, amount label, session column and total column of each
+    # transfer direction shown in the status bar
+    TRANSFERS = (
+        ("status_uploading", "status_uploaded", "session_uploaded", "total_uploaded"),
+        (
+            "status_downloading",
+            "status_downloaded",
+            "session_downloaded",
+            "total_downloaded",
+        ),
+    )
+
+    # Status bar labels, the builder ids double as attribute names
+    LABELS = (
+        "status_uploading",
+        "status_uploaded",
+        "status_downloading",
+        "status_downloaded",
+        "status_ip",
+    )
+
     def __init__(self, builder, model):
         logger.info("StatusBar startup", extra={"class_name": self.__class__.__name__})
         self.builder = builder
@@ -18,16 +46,34 @@ class Statusbar(Component):
         self.settings.connect("attribute-changed", self.handle_settings_changed)
 
         self.ip = "0.0.0.0"
+        # last text applied to each label
+        self.label_texts = {}
 
-        self.status_uploading = self.builder.get_object("status_uploading")
-        self.status_uploaded = self.builder.get_object("status_uploaded")
-        self.status_downloading = self.builder.get_object("status_downloading")
-        self.status_downloaded = self.builder.get_object("status_downloaded")
-        self.status_ip = self.builder.get_object("status_ip")
+        get = self.builder.get_object
+        for label in self.LABELS:
+            setattr(self, label, get(label))
 
-        self.last_session_uploaded = 0
-        self.last_session_downloaded = 0
+        self.transfers = [
+            (getattr(self, speed), getattr(self, amount), session, total)
+            for speed, amount, session, total in self.TRANSFERS
+        ]
+        self.last_session = {session: 0 for _, _, session, _ in self.TRANSFERS}
+        self.total_columns = tuple(
+            column
+            for _, _, session, total in self.TRANSFERS
+            for column in (session, total)
+        )
+        self.totals = {}
+        # column values each torrent last contributed to the totals
+        self.torrent_values = {}
+        self.changed_torrents = set()
+        self.totals_stale = True
         self.last_execution_time = time.time()
+        # every torrent signals each tick, the burst is folded into one update
+        self.update_scheduled = False
+
+        # Look the public address up without blocking the main loop
+        threading.Thread(target=self.fetch_ip, daemon=True).start()
 
         self.status_bar = builder.get_object("status_bar")
         self.status_bar.set_css_name("statusbar")
@@ -38,98 +84,130 @@ class Statusbar(Component):
         self.status_bar.set_margin_start(10)
         self.status_bar.set_margin_end(10)
 
+    def fetch_ip(self):
+        # Runs on a worker thread, the label is updated back on the main loop
+        self.get_ip()
+        GLib.idle_add(self.update_ip_label)
+
+    def update_ip_label(self):
+        ip = "" if self.ip == "0.0.0.0" else self.ip
+        self.set_label_text(self.status_ip, "  " + ip)
+        return False
+
+    def set_label_text(self, label, text):
+        # Identical text still invalidates the label's layout, skip it
+        if self.label_texts.get(label) != text:
+            label.set_text(text)
+            self.label_texts[label] = text
+
     def get_ip(self):
         try:
             if self.ip != "0.0.0.0":
                 return self.ip
             response = requests.get("https://ifconfig.me/")
             if response.status_code == 200:
-                self.ip = response.content.decode("UTF-8")
+                # Only show the reply if it parses as an address
+                self.ip = str(ipaddress.ip_address(response.text.strip()))
                 return self.ip
             else:
                 self.ip = ""
                 return self.ip
-        except requests.exceptions.RequestException:
+        except (requests.exceptions.RequestException, ValueError):
             self.ip = ""
             return self.ip
 
-    def sum_column_values(self, column_name):
-        total_sum = 0
-
-        # Get the list of attributes for each entry in the torrent_list
-        attribute_list = [
-            getattr(entry, column_name) for entry in self.model.torrent_list
-        ]
-
-        # Sum the values based on the specified attribute
-        total_sum = sum(attribute_list)
-
-        return total_sum
+    def sum_column_values(self, column_names):
+        # Accumulate every column in a single walk of the torrent list, the
+        # totals dict is cleared and refilled in place on each resync
+        totals = self.totals
+        for column_name in column_names:
+            totals[column_name] = 0
+
+        torrent_values = self.torrent_values
+        torrent_values.clear()
+        for entry in self.model.torrent_list:
+            values = tuple(getattr(entry, column_name) for column_name in column_names)
+            torrent_values[entry] = values
+            for column_name, value in zip(column_names, values):
+                totals[column_name] += value
+
+        return totals
+
+    def apply_torrent_changes(self, column_names):
+        # Move the totals by the difference of each torrent that ticked since
+        # the last refresh instead of summing the whole list again
+        totals = self.totals
+        torrent_values = self.torrent_values
+        for entry in self.changed_torrents:
+            values = tuple(getattr(entry, column_name) for column_name in column_names)
+            previous = torrent_values[entry]
+            torrent_values[entry] = values
+            for column_name, value, old in zip(column_names, values, previous):
+                totals[column_name] += value - old
+        self.changed_torrents.clear()
+
+        return totals
 
     def update_view(self, model, torrent, attribute):
+        # Ticks name the torrent that changed, anything else resyncs the totals
+        if attribute == "attribute" and torrent in self.torrent_values:
+            self.changed_torrents.add(torrent)
+        else:
+            self.totals_stale = True
+        self.schedule_update()
+
+    def refresh_view(self):
         current_time = time.time()
         if current_time < self.last_execution_time + self.settings.tickspeed:
             return False
 
         self.last_execution_time = current_time
 
-        session_uploaded = self.sum_column_values("session_uploaded")
-        session_upload_speed = (session_uploaded - self.last_session_uploaded) / int(
-            self.settings.tickspeed
-        )
-        self.last_session_uploaded = session_uploaded
-
-        session_upload_speed = humanbytes(session_upload_speed)
-        session_uploaded = humanbytes(session_uploaded)
-
-        total_uploaded = self.sum_column_values("total_uploaded")
-        total_uploaded = humanbytes(total_uploaded)
-
-        session_downloaded = self.sum_column_values("session_downloaded")
-        session_downloaded_speed = (
-            session_downloaded - self.last_session_downloaded
-        ) / int(self.settings.tickspeed)
-        self.last_session_downloaded = session_downloaded
-
-        session_download_speed = humanbytes(session_downloaded_speed)
-        session_downloaded = humanbytes(session_downloaded)
-
-        total_downloaded = self.sum_column_values("total_downloaded")
-        total_downloaded = humanbytes(total_downloaded)
-
-        self.status_uploading.set_text(" " + session_upload_speed + " /s")
-        self.status_uploaded.set_text(
-            "  {} / {}".format(session_uploaded, total_uploaded)
-        )
-        self.status_downloading.set_text(" " + session_download_speed + " /s")
-        self.status_downloaded.set_text(
-            "  {} / {}".format(session_downloaded, total_downloaded)
-        )
-        self.status_ip.set_text("  " + self.get_ip())
-
-    def handle_settings_changed(self, source, key, value):
-        logger.debug(
-            "Torrents view settings changed",
-            extra={"class_name": self.__class__.__name__},
-        )
-        # print(key + " = " + value)
+        tickspeed = int(self.settings.tickspeed)
+        if self.totals_stale:
+            self.totals_stale = False
+            self.changed_torrents.clear()
+            totals = self.sum_column_values(self.total_columns)
+        else:
+            totals = self.apply_torrent_changes(self.total_columns)
+        for speed_label, amount_label, session_column, total_column in self.transfers:
+            session = totals[session_column]
+            # Whole bytes per second, a float rate would rarely repeat and
+            # miss the humanbytes cache every tick
+            speed = (session - self.last_session[session_column]) // tickspeed
+            self.last_session[session_column] = session
+            total = totals[total_column]
+
+            self.set_label_text(speed_label, SPEED_TEXT % humanbytes(speed))
+            self.set_label_text(
+                amount_label, AMOUNT_TEXT % (humanbytes(session), humanbytes(total))
+            )
+
+        self.update_ip_label()
+
+    def schedule_update(self):
+        # Only mark the view dirty here, the idle runs once for the whole burst
+        if not self.update_scheduled:
+            self.update_scheduled = True
+            GLib.idle_add(self.flush_update)
+
+    def flush_update(self):
+        self.update_scheduled = False
+        self.refresh_view()
+        return False
 
     def handle_model_changed(self, source, data_obj, data_changed):
-        logger.info(
-            "StatusBar settings changed",
-            extra={"class_name": self.__class__.__name__},
-        )
-        self.update_view(None, None, None)
+        if DEBUG_ENABLED:
+            logger.debug(
+                "StatusBar model changed",
+                extra={"class_name": self.__class__.__name__},
+            )
+        self.schedule_update()
 
     def handle_attribute_changed(self, source, key, value):
-        logger.debug(
-            "Attribute changed",
-            extra={"class_name": self.__class__.__name__},
-        )
-        self.update_view(None, None, None)
-
-    def model_selection_changed(self, source, model, torrent):
-        logger.debug(
-            "Model selection changed",
-            extra={"class_name": self.__class__.__name__},
-        )
+        if DEBUG_ENABLED:
+            logger.debug(
+                "Attribute changed",
+                extra={"class_name": self.__class__.__name__},
+            )
+        self.schedule_update()
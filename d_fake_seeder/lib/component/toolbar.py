@@ -2,18 +2,40 @@ import math
 import os
 import shutil
 
-import gi
+from gi.repository import Gtk
 from lib.component.component import Component
-from lib.logger import logger
+from lib.logger import DEBUG_ENABLED, logger
 from lib.settings import Settings
 
-gi.require_version("Gdk", "4.0")
-gi.require_version("Gtk", "4.0")
-
-from gi.repository import Gtk  # noqa
-
 
 class Toolbar(Component):
+    # Attribute name, builder id and clicked handler of each toolbar button
+    TOOLBAR_BUTTONS = (
+        ("toolbar_add_button", "toolbar_add", "on_toolbar_add_clicked"),
+        ("toolbar_remove_button", "toolbar_remove", "on_toolbar_remove_clicked"),
+        ("toolbar_search_button", "toolbar_search", "on_toolbar_remove_clicked"),
+        ("toolbar_pause_button", "toolbar_pause", "on_toolbar_pause_clicked"),
+        ("toolbar_resume_button", "toolbar_resume", "on_toolbar_resume_clicked"),
+        ("toolbar_up_button", "toolbar_up", "on_toolbar_up_clicked"),
+        ("toolbar_down_button", "toolbar_down", "on_toolbar_down_clicked"),
+        ("toolbar_settings_button", "toolbar_settings", "on_toolbar_settings_clicked"),
+    )
+
+    # Selection state bits, a button is sensitive when all its bits are set
+    SELECTED = 1
+    ACTIVE = 2
+    PAUSED = 4
+
+    # Buttons that act on the selected torrent and the state each one needs
+    SELECTION_BUTTONS = (
+        ("toolbar_remove_button", SELECTED),
+        ("toolbar_pause_button", SELECTED | ACTIVE),
+        ("toolbar_resume_button", SELECTED | PAUSED),
+        ("toolbar_up_button", SELECTED),
+        ("toolbar_down_button", SELECTED),
+        ("toolbar_settings_button", SELECTED),
+    )
+
     def __init__(self, builder, model, app):
         logger.info("Toolbar startup", extra={"class_name": self.__class__.__name__})
         self.builder = builder
@@ -24,49 +46,29 @@ class Toolbar(Component):
         self.settings = Settings.get_instance()
         self.settings.connect("attribute-changed", self.handle_settings_changed)
 
-        self.toolbar_add_button = self.builder.get_object("toolbar_add")
-        self.toolbar_add_button.connect("clicked", self.on_toolbar_add_clicked)
-        self.toolbar_add_button.add_css_class("flat")
-
-        self.toolbar_remove_button = self.builder.get_object("toolbar_remove")
-        self.toolbar_remove_button.connect("clicked", self.on_toolbar_remove_clicked)
-        self.toolbar_remove_button.add_css_class("flat")
-
-        self.toolbar_search_button = self.builder.get_object("toolbar_search")
-        self.toolbar_search_button.connect("clicked", self.on_toolbar_remove_clicked)
-        self.toolbar_search_button.add_css_class("flat")
-
-        self.toolbar_pause_button = self.builder.get_object("toolbar_pause")
-        self.toolbar_pause_button.connect("clicked", self.on_toolbar_pause_clicked)
-        self.toolbar_pause_button.add_css_class("flat")
-
-        self.toolbar_resume_button = self.builder.get_object("toolbar_resume")
-        self.toolbar_resume_button.connect("clicked", self.on_toolbar_resume_clicked)
-        self.toolbar_resume_button.add_css_class("flat")
+        get = self.builder.get_object
+        for attribute, builder_id, handler in self.TOOLBAR_BUTTONS:
+            button = get(builder_id)
+            button.connect("clicked", getattr(self, handler))
+            button.add_css_class("flat")
+            setattr(self, attribute, button)
 
-        self.toolbar_up_button = self.builder.get_object("toolbar_up")
-        self.toolbar_up_button.connect("clicked", self.on_toolbar_up_clicked)
-        self.toolbar_up_button.add_css_class("flat")
+        # Last sensitivity applied to each button, keyed by attribute name
+        self.selection = None
+        self.button_sensitivity = {}
+        self.update_button_sensitivity()
 
-        self.toolbar_down_button = self.builder.get_object("toolbar_down")
-        self.toolbar_down_button.connect("clicked", self.on_toolbar_down_clicked)
-        self.toolbar_down_button.add_css_class("flat")
-
-        self.toolbar_settings_button = self.builder.get_object("toolbar_settings")
-        self.toolbar_settings_button.connect(
-            "clicked", self.on_toolbar_settings_clicked
-        )
-        self.toolbar_settings_button.add_css_class("flat")
-
-        self.toolbar_refresh_rate = self.builder.get_object("toolbar_refresh_rate")
+        self.toolbar_refresh_rate = get("toolbar_refresh_rate")
         adjustment = Gtk.Adjustment.new(0, 1, 60, 1, 1, 1)
         adjustment.set_step_increment(1)
         self.toolbar_refresh_rate.set_adjustment(adjustment)
         self.toolbar_refresh_rate.set_digits(0)
+        # Load the initial value before connecting so startup does not write the
+        # tickspeed straight back to the settings file
+        self.toolbar_refresh_rate.set_value(int(self.settings.tickspeed))
         self.toolbar_refresh_rate.connect(
             "value-changed", self.on_toolbar_refresh_rate_changed
         )
-        self.toolbar_refresh_rate.set_value(int(self.settings.tickspeed))
         self.toolbar_refresh_rate.set_size_request(150, -1)
 
     def on_toolbar_refresh_rate_changed(self, value):
@@ -91,11 +93,13 @@ class Toolbar(Component):
             return
 
         logger.info(
-            "Toolbar remove " + selected.filepath,
+            "Toolbar remove %s",
+            selected.filepath,
             extra={"class_name": self.__class__.__name__},
         )
         logger.info(
-            "Toolbar remove " + str(selected.id),
+            "Toolbar remove %s",
+            selected.id,
             extra={"class_name": self.__class__.__name__},
         )
         try:
@@ -104,69 +108,61 @@ class Toolbar(Component):
             print(e)
             pass
         self.model.remove_torrent(selected.filepath)
+        self.selection = None
+        self.update_button_sensitivity()
 
     def on_toolbar_pause_clicked(self, button):
         logger.info(
             "Toolbar pause button clicked",
             extra={"class_name": self.__class__.__name__},
         )
-        selected = self.get_selected_torrent()
-        if not selected:
-            return
-
-        selected.active = False
-        self.model.emit("data-changed", self.model, selected)
+        self.set_selected_active(False)
 
     def on_toolbar_resume_clicked(self, button):
         logger.info(
             "Toolbar resume button clicked",
             extra={"class_name": self.__class__.__name__},
         )
-        selected = self.get_selected_torrent()
-        if not selected:
-            return
-
-        selected.active = True
-        self.model.emit("data-changed", self.model, selected)
+        self.set_selected_active(True)
 
     def on_toolbar_up_clicked(self, button):
         logger.info(
             "Toolbar up button clicked",
             extra={"class_name": self.__class__.__name__},
         )
-        selected = self.get_selected_torrent()
-        if not selected:
-            return
-
-        if not selected or selected.id == 1:
-            return
-
-        for torrent in self.model.torrent_list:
-            if torrent.id == selected.id - 1:
-                torrent.id = selected.id
-                selected.id -= 1
-                self.model.emit("data-changed", self.model, selected)
-                self.model.emit("data-changed", self.model, torrent)
-                break
+        self.move_selected(-1)
 
     def on_toolbar_down_clicked(self, button):
         logger.info(
             "Toolbar down button clicked",
             extra={"class_name": self.__class__.__name__},
         )
+        self.move_selected(1)
+
+    def set_selected_active(self, active):
+        selected = self.get_selected_torrent()
+        if not selected:
+            return
+
+        selected.active = active
+        self.update_button_sensitivity()
+        self.model.emit("data-changed", self.model, selected)
+
+    def move_selected(self, offset):
         selected = self.get_selected_torrent()
         if not selected:
             return
 
-        if not selected or selected.id == len(self.model.torrent_list):
+        target_id = selected.id + offset
+        if target_id < 1 or target_id > len(self.model.torrent_list):
             return
 
         for torrent in self.model.torrent_list:
-            if torrent.id == selected.id + 1:
+            if torrent.id == target_id:
                 torrent.id = selected.id
-                selected.id += 1
+                selected.id = target_id
+                # Both ids changed, a single refresh covers the swap
                 self.model.emit("data-changed", self.model, selected)
-                self.model.emit("data-changed", self.model, torrent)
                 break
 
     def on_toolbar_settings_clicked(self, button):
@@ -224,28 +220,32 @@ class Toolbar(Component):
     def get_selected_torrent(self):
         return self.selection
 
-    def update_view(self, model, torrent, attribute):
-        pass
+    def update_button_sensitivity(self):
+        selected = self.selection
+        if selected is None:
+            state = 0
+        else:
+            state = self.SELECTED | (self.ACTIVE if selected.active else self.PAUSED)
 
-    def handle_settings_changed(self, source, key, value):
-        logger.debug(
-            "Torrents view settings changed",
-            extra={"class_name": self.__class__.__name__},
-        )
-        # print(key + " = " + value)
+        for attribute, needs in self.SELECTION_BUTTONS:
+            self.set_button_sensitive(attribute, state & needs == needs)
 
-    def handle_model_changed(self, source, data_obj, data_changed):
-        logger.info(
-            "Toolbar settings changed",
-            extra={"class_name": self.__class__.__name__},
-        )
-        # print(key + " = " + value)
+    def set_button_sensitive(self, attribute, sensitive):
+        # Only touch the widget when the state flips, set_sensitive notifies
+        # and restyles the button even for an unchanged value
+        if self.button_sensitivity.get(attribute) == sensitive:
+            return
+        self.button_sensitivity[attribute] = sensitive
+        getattr(self, attribute).set_sensitive(sensitive)
 
-    def handle_attribute_changed(self, source, key, value):
-        logger.debug(
-            "Attribute changed",
-            extra={"class_name": self.__class__.__name__},
-        )
+    def handle_model_changed(self, source, data_obj, data_changed):
+        if DEBUG_ENABLED:
+            logger.debug(
+                "Toolbar model changed",
+                extra={"class_name": self.__class__.__name__},
+            )
+        # Torrents can pause themselves, keep pause and resume in step
+        self.update_button_sensitivity()
 
     def model_selection_changed(self, source, model, torrent):
         logger.debug(
@@ -253,3 +253,4 @@ class Toolbar(Component):
             extra={"class_name": self.__class__.__name__},
         )
         self.selection = torrent
+        self.update_button_sensitivity()
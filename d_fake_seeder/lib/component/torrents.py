@@ -1,8 +1,10 @@
-import gi
+import sys
+
+from gi.repository import Gio, GLib, GObject, Gtk
 from lib.component.component import Component
-from lib.logger import logger
+from lib.logger import DEBUG_ENABLED, logger
 from lib.settings import Settings
-from lib.torrent.model.attributes import Attributes
+from lib.torrent.model.attributes import ATTRIBUTE_NAMES, Attributes
 from lib.util.helpers import (
     add_kb,
     add_percent,
@@ -10,10 +12,26 @@ from lib.util.helpers import (
     humanbytes,
 )
 
-gi.require_version("Gdk", "4.0")
-gi.require_version("Gtk", "4.0")
+# Map text renderer names from the settings to functions, keys are interned so
+# lookups with an interned setting value compare by identity
+TEXT_RENDERERS = {
+    sys.intern(name): func
+    for name, func in (
+        ("add_kb", add_kb),
+        ("add_percent", add_percent),
+        (
+            "convert_seconds_to_hours_mins_seconds",
+            convert_seconds_to_hours_mins_seconds,
+        ),
+        ("humanbytes", humanbytes),
+    )
+}
+
+# Bound once, the row setup reads it for every label it creates
+ALIGN_START = Gtk.Align.START
 
-from gi.repository import Gio, GLib, GObject, Gtk  # noqa
+# Column order of the torrents view, the id column always comes first
+COLUMN_ATTRIBUTES = ("id",) + tuple(name for name in ATTRIBUTE_NAMES if name != "id")
 
 
 class Torrents(Component):
@@ -43,6 +61,7 @@ class Torrents(Component):
         # Create an action group
         self.action_group = Gio.SimpleActionGroup()
         self.stateful_actions = {}
+        self.popover = None
 
         # Insert the action group into the window
         self.window.insert_action_group("app", self.action_group)
@@ -55,6 +74,12 @@ class Torrents(Component):
         self.torrents_columnview.set_show_column_separators(True)
         self.torrents_columnview.set_show_row_separators(True)
 
+        # The columnview keeps the same sorter for its lifetime
+        self.sorter = self.torrents_columnview.get_sorter()
+
+        # columns of the columnview, keyed by attribute
+        self.columns = {}
+        self.column_visibility = {}
         self.update_columns()
 
     def main_menu(self, gesture, n_press, x, y):
@@ -64,11 +89,15 @@ class Torrents(Component):
         rect.x = x
         rect.y = y
 
-        ATTRIBUTES = Attributes
-        attributes = [
-            prop.name.replace("-", "_") for prop in GObject.list_properties(ATTRIBUTES)
-        ]
+        # The menu and its actions only depend on the attributes, build them
+        # on the first right click and reuse them afterwards
+        if self.popover is None:
+            self.popover = self.create_main_menu()
+
+        self.popover.set_pointing_to(rect)
+        self.popover.popup()
 
+    def create_main_menu(self):
         menu = Gio.Menu.new()
 
         # Create submenus
@@ -86,154 +115,151 @@ class Torrents(Component):
 
         columns_menu = Gio.Menu.new()
 
-        # Check if the attribute is a visible column in the columnview
-        visible_columns = [
-            "id" if column.get_title() == "#" else column.get_title()
-            for column in self.torrents_columnview.get_columns()
-            if column.get_visible()
-        ]
-
-        # Create a stateful action for each attribute
-        for attribute in attributes:
-            if attribute not in self.stateful_actions.keys():
-                state = attribute in visible_columns
+        # Create a stateful action for each attribute from the cached column
+        # visibility, their state is kept in step by
+        # on_stateful_action_change_state from here on
+        for attribute in ATTRIBUTE_NAMES:
+            state = self.column_visibility.get(attribute, False)
 
-                self.stateful_actions[attribute] = Gio.SimpleAction.new_stateful(
-                    f"toggle_{attribute}",
-                    None,
-                    GLib.Variant.new_boolean(state),
-                )
-                self.stateful_actions[attribute].connect(
-                    "change-state", self.on_stateful_action_change_state
-                )
+            self.stateful_actions[attribute] = Gio.SimpleAction.new_stateful(
+                f"toggle_{attribute}",
+                None,
+                GLib.Variant.new_boolean(state),
+            )
+            self.stateful_actions[attribute].connect(
+                "change-state", self.on_stateful_action_change_state
+            )
 
-                self.action_group.add_action(self.stateful_actions[attribute])
+            self.action_group.add_action(self.stateful_actions[attribute])
 
         # Iterate over attributes and add toggle items for each one
-        for attribute in attributes:
+        for attribute in ATTRIBUTE_NAMES:
             toggle_item = Gio.MenuItem.new(label=f"{attribute}")
             toggle_item.set_detailed_action(f"app.toggle_{attribute}")
             columns_menu.append_item(toggle_item)
 
         menu.append_submenu("Columns", columns_menu)
 
-        self.popover = Gtk.PopoverMenu().new_from_model(menu)
-        self.popover.set_parent(self.torrents_columnview)
-        self.popover.set_has_arrow(False)
-        self.popover.set_halign(Gtk.Align.START)
-        self.popover.set_pointing_to(rect)
-        self.popover.popup()
+        popover = Gtk.PopoverMenu().new_from_model(menu)
+        popover.set_parent(self.torrents_columnview)
+        popover.set_has_arrow(False)
+        popover.set_halign(ALIGN_START)
+        return popover
 
     def on_stateful_action_change_state(self, action, value):
-        self.stateful_actions[
-            action.get_name()[len("toggle_") :]  # noqa: E203
-        ].set_state(GLib.Variant.new_boolean(value.get_boolean()))
-
-        checked_items = []
-        all_unchecked = True
+        attribute = action.get_name()[len("toggle_") :]  # noqa: E203
+        self.stateful_actions[attribute].set_state(
+            GLib.Variant.new_boolean(value.get_boolean())
+        )
 
-        ATTRIBUTES = Attributes
-        attributes = [
-            prop.name.replace("-", "_") for prop in GObject.list_properties(ATTRIBUTES)
+        # Walk the actions once in column order, no title matching or sort
+        stateful_actions = self.stateful_actions
+        checked_items = [
+            title
+            for title in ATTRIBUTE_NAMES
+            if stateful_actions[title].get_state().get_boolean()
         ]
+        all_unchecked = not checked_items
 
-        column_titles = [column if column != "#" else "id" for column in attributes]
-
-        for title in column_titles:
-            for k, v in self.stateful_actions.items():
-                if k == title and v.get_state().get_boolean():
-                    checked_items.append(title)
-                    all_unchecked = False
-                    break
-
-        if all_unchecked or len(checked_items) == len(attributes):
+        if all_unchecked or len(checked_items) == len(ATTRIBUTE_NAMES):
+            # Falling back to all columns can reveal any of them
             self.settings.columns = ""
+            self.update_columns()
         else:
-            checked_items.sort(key=lambda x: column_titles.index(x))
             self.settings.columns = ",".join(checked_items)
+            self.update_columns({attribute})
 
-        self.update_columns()
-
-    def update_columns(self):
-        ATTRIBUTES = Attributes
-        attributes = [
-            prop.name.replace("-", "_") for prop in GObject.list_properties(ATTRIBUTES)
-        ]
-
-        attributes.remove("id")
-        attributes.insert(0, "id")
-
+    def update_columns(self, changed=None):
         # Parse self.settings.columns into a list of column names
-        visible_columns = (
-            self.settings.columns.split(",") if self.settings.columns.strip() else []
-        )
+        visible_columns = [
+            name for name in map(str.strip, self.settings.columns.split(",")) if name
+        ]
 
         # If the list is empty, set all columns to visible
         if not visible_columns:
-            visible_columns = attributes
+            visible_columns = COLUMN_ATTRIBUTES
 
-        # Add or update columns based on attributes
-        for _, attribute in enumerate(attributes):
-            column_title = "#" if attribute == "id" else attribute
-            column = next(
-                (
-                    col
-                    for col in self.torrents_columnview.get_columns()
-                    if col.get_title() == column_title
-                ),
-                None,
-            )
+        # Only the columns whose toggle changed need touching, a full sweep
+        # is kept for the initial load
+        attributes = COLUMN_ATTRIBUTES if changed is None else changed
 
+        # Add or update columns based on attributes
+        for attribute in attributes:
+            column = self.columns.get(attribute)
             if column is None:
-                # Create the column if it doesn't exist
-                column = Gtk.ColumnViewColumn()
-                column.set_title(column_title)
-                column.set_resizable(True)
-
-                # Create a custom factory for the column
-                column_factory = Gtk.SignalListItemFactory()
-                column_factory.connect("setup", self.setup_column_factory, attribute)
-                column_factory.connect("bind", self.bind_column_factory, attribute)
-                column.set_factory(column_factory)
-
-                # Get the type of the attribute
-                attribute_type = Attributes.find_property(
-                    attribute
-                ).value_type.fundamental
-
-                # Create an expression for the attribute
-                attribute_expression = Gtk.PropertyExpression.new(
-                    Attributes, None, attribute
-                )
-
-                # Create a sorter based on the attribute type
-                if attribute_type == GObject.TYPE_STRING:
-                    sorter = Gtk.StringSorter.new(attribute_expression)
-                elif (
-                    attribute_type == GObject.TYPE_LONG
-                    or attribute_type == GObject.TYPE_BOOLEAN
-                    or attribute_type == GObject.TYPE_FLOAT
-                ):
-                    sorter = Gtk.NumericSorter.new(attribute_expression)
-
-                # Set the sorter on the column
-                column.set_sorter(sorter)
-
-                self.torrents_columnview.append_column(column)
-
-            # Set the visibility of the column
-            column.set_visible(attribute in visible_columns)
-
-    def setup_column_factory(self, factory, item, attribute):
+                column = self.create_column(attribute)
+
+            # Set the visibility of the column, only when it flips so the
+            # columnview is not relaid out for a no-op
+            visible = attribute in visible_columns
+            if self.column_visibility.get(attribute) != visible:
+                column.set_visible(visible)
+                self.column_visibility[attribute] = visible
+
+    def create_column(self, attribute):
+        column_title = "#" if attribute == "id" else attribute
+
+        # Create the column if it doesn't exist
+        column = Gtk.ColumnViewColumn()
+        column.set_title(column_title)
+        column.set_resizable(True)
+
+        # Resolve the renderers once per column rather than for every row
+        widget_class, text_renderer = self.get_column_renderers(attribute)
+
+        # Create a custom factory for the column
+        column_factory = Gtk.SignalListItemFactory()
+        column_factory.connect("setup", self.setup_column_factory, widget_class)
+        column_factory.connect(
+            "bind",
+            self.bind_column_factory,
+            attribute,
+            self.get_column_binding(widget_class, text_renderer),
+        )
+        column.set_factory(column_factory)
+
+        # Get the type of the attribute
+        attribute_type = Attributes.find_property(attribute).value_type.fundamental
+
+        # Create an expression for the attribute
+        attribute_expression = Gtk.PropertyExpression.new(Attributes, None, attribute)
+
+        # Create a sorter based on the attribute type
+        if attribute_type == GObject.TYPE_STRING:
+            sorter = Gtk.StringSorter.new(attribute_expression)
+        elif (
+            attribute_type == GObject.TYPE_LONG
+            or attribute_type == GObject.TYPE_BOOLEAN
+            or attribute_type == GObject.TYPE_FLOAT
+        ):
+            sorter = Gtk.NumericSorter.new(attribute_expression)
+
+        # Set the sorter on the column
+        column.set_sorter(sorter)
+
+        self.torrents_columnview.append_column(column)
+        self.columns[attribute] = column
+        return column
+
+    def get_column_renderers(self, attribute):
+        renderers = self.settings.cellrenderers
+        textrenderers = self.settings.textrenderers
+
+        widget_class = eval(renderers[attribute]) if attribute in renderers else None
+        text_renderer = (
+            self.get_text_renderer(textrenderers[attribute])
+            if attribute in textrenderers
+            else None
+        )
+        return widget_class, text_renderer
+
+    def setup_column_factory(self, factory, item, widget_class):
         def setup_when_idle():
             # Create and configure the appropriate widget based on the attribute
-            renderers = self.settings.cellrenderers
             widget = None
 
-            if attribute in renderers:
+            if widget_class is not None:
                 # If using a custom renderer
-                widget_string = renderers[attribute]
-                widget_class = eval(widget_string)
                 widget = widget_class()
                 widget.set_margin_top(1)
                 widget.set_margin_bottom(1)
@@ -244,7 +270,7 @@ class Torrents(Component):
                 # Default widget (e.g., Gtk.Label)
                 widget = Gtk.Label()
                 widget.set_hexpand(True)  # Make the widget expand horizontally
-                widget.set_halign(Gtk.Align.START)  # Align text to the left
+                widget.set_halign(ALIGN_START)  # Align text to the left
                 widget.set_vexpand(True)
 
             # Set the child widget for the item
@@ -252,71 +278,45 @@ class Torrents(Component):
 
         GLib.idle_add(setup_when_idle)
 
-    def bind_column_factory(self, factory, item, attribute):
+    def get_column_binding(self, widget_class, text_renderer):
+        # Target property and transform of the column's cells, every row of
+        # a column binds the same way so this is decided once per column
+        if text_renderer is not None:
+            return "label", text_renderer
+        if widget_class is None or issubclass(widget_class, Gtk.Label):
+            return "label", self.to_str
+        if issubclass(widget_class, Gtk.ProgressBar):
+            return "fraction", None
+        # Add more cases for other widget types as needed
+        return None
+
+    def bind_column_factory(self, factory, item, attribute, binding):
+        if binding is None:
+            return
+        target_property, transform = binding
+
         def bind_when_idle():
-            textrenderers = self.settings.textrenderers
-
-            # Get the widget associated with the item
-            widget = item.get_child()
-
-            # Get the item's data
-            item_data = item.get_item()
-
-            # Use appropriate widget based on the attribute
-            if attribute in textrenderers:
-                # If the attribute has a text renderer defined
-                text_renderer_func_name = textrenderers[attribute]
-
-                # Bind the attribute to the widget's label property
-                item_data.bind_property(
-                    attribute,
-                    widget,
-                    "label",
-                    GObject.BindingFlags.SYNC_CREATE,
-                    self.get_text_renderer(text_renderer_func_name),
-                )
-            else:
-                # For non-text attributes, handle appropriately
-                if isinstance(widget, Gtk.Label):
-                    # Bind the attribute to the widget's label property
-                    item_data.bind_property(
-                        attribute,
-                        widget,
-                        "label",
-                        GObject.BindingFlags.SYNC_CREATE,
-                        self.to_str,
-                    )
-                elif isinstance(widget, Gtk.ProgressBar):
-                    item_data.bind_property(
-                        attribute,
-                        widget,
-                        "fraction",
-                        GObject.BindingFlags.SYNC_CREATE,
-                    )
-                # Add more cases for other widget types as needed
+            # Bind the attribute to the cell widget's property
+            item.get_item().bind_property(
+                attribute,
+                item.get_child(),
+                target_property,
+                GObject.BindingFlags.SYNC_CREATE,
+                transform,
+            )
 
         GLib.idle_add(bind_when_idle)
 
     def get_text_renderer(self, func_name):
-        # Map function names to functions
-        # fmt: off
-        TEXT_RENDERERS = {
-            "add_kb": add_kb,
-            "add_percent": add_percent,
-            "convert_seconds_to_hours_mins_seconds":
-                convert_seconds_to_hours_mins_seconds,
-            "humanbytes": humanbytes,
-        }
+        func = TEXT_RENDERERS[sys.intern(func_name)]
 
         def text_renderer(bind, from_value):
-            func = TEXT_RENDERERS[func_name]
             return func(from_value)
 
         return text_renderer
 
     def update_model(self):
         self.store = self.model.get_liststore()
-        self.sorter = Gtk.ColumnView.get_sorter(self.torrents_columnview)
         self.sort_model = Gtk.SortListModel.new(self.store, self.sorter)
         self.selection = Gtk.MultiSelection.new(self.sort_model)
         self.selection.connect("selection-changed", self.on_selection_changed)
@@ -324,10 +324,11 @@ class Torrents(Component):
 
     # Method to update the ColumnView with compatible attributes
     def update_view(self, model, torrent, updated_attributes):
-        logger.debug(
-            "Torrents update view",
-            extra={"class_name": self.__class__.__name__},
-        )
+        if DEBUG_ENABLED:
+            logger.debug(
+                "Torrents update view",
+                extra={"class_name": self.__class__.__name__},
+            )
 
         self.model = model
 
@@ -340,41 +341,21 @@ class Torrents(Component):
         # item = selection.get_selected_item()
         # if item is not None:
         #     self.model.emit("selection-changed", self.model, item)
+        # Look the selection model up once rather than twice per row
+        selection_model = self.torrents_columnview.get_model()
+        model = self.model
         for i in range(self.store.get_n_items()):
-            if self.torrents_columnview.get_model().is_selected(i):
-                self.model.emit(
-                    "selection-changed",
-                    self.model,
-                    self.torrents_columnview.get_model().get_item(i),
-                )
-
-    def handle_settings_changed(self, source, key, value):
-        logger.debug(
-            "Torrents view settings changed",
-            extra={"class_name": self.__class__.__name__},
-        )
-        # print(key + " = " + value)
+            if selection_model.is_selected(i):
+                model.emit("selection-changed", model, selection_model.get_item(i))
 
     def handle_model_changed(self, source, data_obj, data_changed):
-        logger.debug(
-            "Torrents view settings changed",
-            extra={"class_name": self.__class__.__name__},
-        )
-
-        sorter = Gtk.ColumnView.get_sorter(self.torrents_columnview)
-        sorter.changed(0)
-
-    def handle_attribute_changed(self, source, key, value):
-        logger.debug(
-            "Attribute changed",
-            extra={"class_name": self.__class__.__name__},
-        )
+        if DEBUG_ENABLED:
+            logger.debug(
+                "Torrents view settings changed",
+                extra={"class_name": self.__class__.__name__},
+            )
 
-        sorter = Gtk.ColumnView.get_sorter(self.torrents_columnview)
-        sorter.changed(0)
+        self.sorter.changed(0)
 
-    def model_selection_changed(self, source, model, torrent):
-        logger.debug(
-            "Model selection changed",
-            extra={"class_name": self.__class__.__name__},
-        )
+    # Attribute changes need the same re-sort as model changes
+    handle_attribute_changed = handle_model_changed
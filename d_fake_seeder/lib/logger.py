@@ -21,6 +21,10 @@ if not isinstance(numeric_level, int):
 logger = logging.getLogger(__name__)
 logger.setLevel(numeric_level)
 
+# The level is fixed at startup, hot paths test this instead of building the
+# log call and its extra dict on every tick
+DEBUG_ENABLED = logger.isEnabledFor(logging.DEBUG)
+
 # Create a file handler
 file_handler = logging.FileHandler("log.log")
 file_handler.setLevel(numeric_level)
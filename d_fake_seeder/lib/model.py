@@ -1,10 +1,10 @@
+from collections import Counter
 from urllib.parse import urlparse
 
 import gi  # noqa
-from lib.logger import logger
+from lib.logger import DEBUG_ENABLED, logger
 from lib.settings import Settings
 from lib.torrent.model.attributes import Attributes
-from lib.torrent.model.torrentstate import TorrentState
 from lib.torrent.torrent import Torrent
 
 gi.require_version("Gdk", "4.0")
@@ -41,6 +41,7 @@ class Model(GObject.GObject):
         self.torrent_list_attributes = Gio.ListStore.new(
             Attributes
         )  # List to hold all Attributes instances
+        self.torrents_by_id = {}  # id lookup, rebuilt when the ids move
 
     # Method to add a new torrent
     def add_torrent(self, filepath):
@@ -69,6 +70,8 @@ class Model(GObject.GObject):
         torrent = next((t for t in self.torrent_list if t.filepath == filepath), None)
         if torrent is not None:
             self.torrent_list.remove(torrent)
+            # The removed torrent keeps its id, drop it from the lookup
+            self.torrents_by_id = {}
             for index, item in enumerate(self.torrent_list_attributes):
                 if item.filepath == torrent.filepath:
                     del self.torrent_list_attributes[index]
@@ -97,31 +100,23 @@ class Model(GObject.GObject):
         )
         return self.torrent_list
 
-    def get_trackers_liststore(self):
-        logger.debug(
-            "Model get trackers liststore",
-            extra={"class_name": self.__class__.__name__},
+    def get_torrent_by_id(self, torrent_id):
+        # The views look the selected torrent up every tick, keep the map
+        # across ticks and rebuild it only once an add, remove or move has
+        # left it pointing at a torrent with a different id
+        torrent = self.torrents_by_id.get(torrent_id)
+        if torrent is None or torrent.id != torrent_id:
+            self.torrents_by_id = {t.id: t for t in self.torrent_list}
+            torrent = self.torrents_by_id.get(torrent_id)
+        return torrent
+
+    def get_tracker_counts(self):
+        # Counter tallies the hostnames in C rather than a per-key dict update
+        return Counter(
+            urlparse(torrent.seeder.tracker).hostname
+            for torrent in self.torrent_list
+            if torrent.is_ready()
         )
-        tracker_count = {}
-        for torrent in self.torrent_list:
-            if torrent.is_ready():
-                tracker_url = torrent.seeder.tracker
-                parsed_url = urlparse(tracker_url)
-                fqdn = parsed_url.hostname
-                if fqdn in tracker_count:
-                    tracker_count[fqdn] += 1
-                else:
-                    tracker_count[fqdn] = 1
-
-        # Create a list store with the custom GObject type TorrentState
-        list_store = Gio.ListStore.new(TorrentState)
-
-        for fqdn, count in tracker_count.items():
-            # Create a new instance of TorrentState and
-            # append it to the list store
-            list_store.append(TorrentState(fqdn, count))
-
-        return list_store
 
     def stop(self):
         # Stopping all torrents before quitting
@@ -144,8 +139,10 @@ class Model(GObject.GObject):
         # print(key + " = " + value)
 
     def handle_model_changed(self, source, data_obj, data_changed):
-        logger.info(
-            "Notebook settings changed",
-            extra={"class_name": self.__class__.__name__},
-        )
-        self.emit("data-changed", data_obj, "attribute")
+        if DEBUG_ENABLED:
+            logger.debug(
+                "Model torrent changed",
+                extra={"class_name": self.__class__.__name__},
+            )
+        # Pass the ticking torrent on so views can update just its share
+        self.emit("data-changed", source, "attribute")
@@ -3,9 +3,9 @@ import os
 import shutil
 from threading import Lock
 
-from gi.repository import GObject
+from gi.repository import GLib, GObject
 from lib.handlers.FileModifiedEventHandler import FileModifiedEventHandler
-from lib.logger import logger
+from lib.logger import DEBUG_ENABLED, logger
 from watchdog.observers import Observer
 
 
@@ -55,6 +55,7 @@ class Settings(GObject.Object):
         super().__init__()
         self._file_path = file_path
         self._last_modified = 0
+        self._save_source = None
         self.load_settings()
         Settings._instance = self
 
@@ -95,9 +96,24 @@ class Settings(GObject.Object):
         with open(self._file_path, "w") as f:
             json.dump(self._settings, f, indent=4)
 
+    def schedule_save(self):
+        # Coalesce bursts of changes into a single write of the settings file
+        if self._save_source is not None:
+            GLib.source_remove(self._save_source)
+        self._save_source = GLib.timeout_add(400, self.save_when_idle)
+
+    def save_when_idle(self):
+        self._save_source = None
+        self.save_settings()
+        return False
+
     def save_quit(self):
         logger.info("Settings quit", extra={"class_name": self.__class__.__name__})
         self._observer.stop()
+        # Flush any pending write now, the main loop is about to stop
+        if self._save_source is not None:
+            GLib.source_remove(self._save_source)
+            self._save_source = None
         self.save_settings()
 
     def __getattr__(self, name):
@@ -109,10 +125,11 @@ class Settings(GObject.Object):
             raise AttributeError(f"Setting '{name}' not found.")
 
     def __setattr__(self, name, value):
-        logger.debug(
-            "Settings __setattr__",
-            extra={"class_name": self.__class__.__name__},
-        )
+        if DEBUG_ENABLED:
+            logger.debug(
+                "Settings __setattr__",
+                extra={"class_name": self.__class__.__name__},
+            )
         # Acquire the lock before modifying the settings
         with Settings._lock:
             if name == "_settings":
@@ -122,17 +139,20 @@ class Settings(GObject.Object):
                 # Set the attribute without modifying 'settings' or emitting
                 # signals
                 super().__setattr__(name, value)
-            else:
+            elif "." in name:
+                # Update the nested attribute, only dotted names need splitting
                 nested_attribute = name.split(".")
-                if len(nested_attribute) > 1:
-                    # Update the nested attribute
-                    current = self._settings
-                    for attr in nested_attribute[:-1]:
-                        current = current.setdefault(attr, {})
-                    current[nested_attribute[-1]] = value
-                else:
-                    # Set the setting value and emit the 'attribute-changed'
-                    # signal
-                    self._settings[name] = value
-                    self.emit("attribute-changed", name, value)
-                    self.save_settings()
+                current = self._settings
+                for attr in nested_attribute[:-1]:
+                    current = current.setdefault(attr, {})
+                current[nested_attribute[-1]] = value
+            else:
+                # Skip unchanged values so listeners and the settings
+                # file are not touched for a no-op assignment
+                if name in self._settings and self._settings[name] == value:
+                    return
+                # Set the setting value and emit the 'attribute-changed'
+                # signal
+                self._settings[name] = value
+                self.emit("attribute-changed", name, value)
+                self.schedule_save()
@@ -1,5 +1,6 @@
 import hashlib
 from datetime import datetime
+from functools import cached_property
 
 import lib.torrent.bencoding as bencoding
 import lib.util.helpers as helpers
@@ -23,13 +24,15 @@ class File:
                 if b"announce-list" in self.torrent_header:
                     announce_list = self.torrent_header[b"announce-list"]
                     if isinstance(announce_list, list):
-                        # Extract announce URLs from the announce-list
-                        announce_urls = [
+                        # Extract announce URLs from the announce-list, tiers
+                        # often repeat a tracker so keep each one once, in
+                        # first seen order
+                        announce_urls = dict.fromkeys(
                             url.decode("utf-8")
                             for sublist in announce_list
                             for url in sublist
-                        ]
-                        self.announce_list = announce_urls
+                        )
+                        self.announce_list = list(announce_urls)
 
                 torrent_info = self.torrent_header[b"info"]
                 m = hashlib.sha1()
@@ -38,11 +41,14 @@ class File:
                 break
             except Exception as e:
                 logger.info(
-                    "File read error: " + str(e),
+                    "File read error: %s",
+                    e,
                     extra={"class_name": self.__class__.__name__},
                 )
 
-    @property
+    # The torrent header never changes after loading, so the derived values
+    # are computed once instead of on every update tick
+    @cached_property
     def total_size(self):
         logger.debug("File size", extra={"class_name": self.__class__.__name__})
         size = 0
@@ -57,7 +63,7 @@ class File:
 
         return size
 
-    @property
+    @cached_property
     def name(self):
         logger.debug("File name", extra={"class_name": self.__class__.__name__})
         torrent_info = self.torrent_header[b"info"]
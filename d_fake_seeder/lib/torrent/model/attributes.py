@@ -30,3 +30,10 @@ class Attributes(GObject.Object):
     def __init__(self):
         super().__init__()
         self.uuid = str(uuid.uuid4())
+
+
+# Names of the Attributes properties, computed once as the property list is
+# fixed at class definition
+ATTRIBUTE_NAMES = tuple(
+    prop.name.replace("-", "_") for prop in GObject.list_properties(Attributes)
+)
@@ -0,0 +1,11 @@
+from gi.repository import GObject
+
+
+class TorrentFile(GObject.Object):
+    path = GObject.Property(type=GObject.TYPE_STRING, default="")
+    size = GObject.Property(type=GObject.TYPE_STRING, default="")
+
+    def __init__(self, path, size):
+        super().__init__()
+        self.path = path
+        self.size = size
@@ -4,6 +4,9 @@ from gi.repository import GObject
 
 
 class TorrentState(GObject.Object):
+    # Named so list item templates can look its properties up
+    __gtype_name__ = "TorrentState"
+
     tracker = GObject.Property(type=GObject.TYPE_STRING, default="")
     count = GObject.Property(type=GObject.TYPE_INT, default=0)
 
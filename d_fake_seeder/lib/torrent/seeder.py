@@ -18,9 +18,11 @@ class Seeder:
         self.check_announce_attribute(torrent)
 
     def check_announce_attribute(self, torrent, attempts=3):
-        if hasattr(torrent, "announce"):
+        # One lookup instead of a hasattr probe followed by the read
+        announce = getattr(torrent, "announce", None)
+        if announce is not None:
             self.ready = True
-            parsed_url = urlparse(torrent.announce)
+            parsed_url = urlparse(announce)
             if parsed_url.scheme == "http" or parsed_url.scheme == "https":
                 self.seeder = HTTPSeeder(torrent)
             elif parsed_url.scheme == "udp":
@@ -1,4 +1,5 @@
 import random
+import socket
 import struct
 import threading
 from urllib.parse import urlparse
@@ -18,9 +19,12 @@ class BaseSeeder:
     def __init__(self, torrent):
         logger.info("Seeder Startup", extra={"class_name": self.__class__.__name__})
 
-        # subscribe to settings changed
+        # subscribe to settings changed without the settings singleton keeping
+        # the seeder alive
         self.settings = Settings.get_instance()
-        self.settings.connect("attribute-changed", self.handle_settings_changed)
+        helpers.connect_weak(
+            self.settings, "attribute-changed", self.handle_settings_changed
+        )
 
         self.torrent = torrent
         self.tracker_url = ""
@@ -35,24 +39,20 @@ class BaseSeeder:
         self.tracker_url = self.torrent.announce
         self.parsed_url = urlparse(self.tracker_url)
         self.tracker_scheme = self.parsed_url.scheme
-        if hasattr(self.torrent, "announce_list"):
-            self.tracker_urls = [
-                url
-                for url in self.torrent.announce_list
-                if urlparse(url).scheme == self.tracker_scheme
-            ]
+        # Announce URLs this seeder can switch to, the scheme never changes
+        # so the list is parsed once here rather than on every failover
+        self.tracker_urls = [
+            url
+            for url in getattr(self.torrent, "announce_list", ())
+            if urlparse(url).scheme == self.tracker_scheme
+        ]
         self.tracker_hostname = self.parsed_url.hostname
         self.tracker_port = self.parsed_url.port
 
     def set_random_announce_url(self):
-        if hasattr(self.torrent, "announce_list") and self.torrent.announce_list:
-            same_schema_urls = [
-                url
-                for url in self.torrent.announce_list
-                if urlparse(url).scheme == self.tracker_scheme
-            ]
-            if same_schema_urls:
-                random_url = random.choice(same_schema_urls)
+        if getattr(self.torrent, "announce_list", None):
+            if self.tracker_urls:
+                random_url = random.choice(self.tracker_urls)
                 self.tracker_url = random_url
                 self.parsed_url = urlparse(self.tracker_url)
                 self.tracker_scheme = self.parsed_url.scheme
@@ -90,7 +90,9 @@ class BaseSeeder:
 
     def handle_exception(self, e, message):
         logger.info(
-            f"{message}: {str(e)}",
+            "%s: %s",
+            message,
+            e,
             extra={"class_name": self.__class__.__name__},
         )
         self.tracker_semaphore.release()
@@ -121,12 +123,10 @@ class BaseSeeder:
         if b"peers" not in self.info:
             return result
         peers = self.info[b"peers"]
-        for i in range(len(peers) // 6):
-            ip = peers[i : i + 4]  # noqa: E203
-            ip = ".".join("%d" % x for x in ip)
-            port = peers[i + 4 : i + 6]  # noqa: E203
-            port = struct.unpack(">H", port)[0]
-            result.append("%s:%d" % (ip, port))
+        # Compact peer list, 4 address bytes and a big endian port per peer
+        compact = peers[: len(peers) - len(peers) % 6]
+        for ip, port in struct.iter_unpack(">4sH", compact):
+            result.append("%s:%d" % (socket.inet_ntoa(ip), port))
 
         return result
 
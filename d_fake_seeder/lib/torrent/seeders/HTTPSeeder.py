@@ -9,8 +9,27 @@ from lib.view import View
 
 
 class HTTPSeeder(BaseSeeder):
+    # Settings the request headers are built from
+    HEADER_SETTINGS = ("http_headers", "agents", "agent")
+
     def __init__(self, torrent):
         super().__init__(torrent)
+        self.http_headers = None
+
+    def handle_settings_changed(self, source, key, value):
+        super().handle_settings_changed(source, key, value)
+        if key in self.HEADER_SETTINGS:
+            self.http_headers = None
+
+    def get_http_headers(self):
+        # Build the headers on first use and after a relevant settings change,
+        # copying so the User-Agent is not written into the shared settings
+        if self.http_headers is None:
+            settings = self.settings
+            agent = settings.agents[settings.agent].split(",")[0]
+            self.http_headers = dict(settings.http_headers)
+            self.http_headers["User-Agent"] = agent
+        return self.http_headers
 
     def load_peers(self):
         logger.info("Seeder load peers", extra={"class_name": self.__class__.__name__})
@@ -73,16 +92,11 @@ class HTTPSeeder(BaseSeeder):
         if download_left == 0:
             http_params["event"] = "started"
 
-        http_agent_headers = self.settings.http_headers
-        http_agent_headers["User-Agent"] = self.settings.agents[
-            self.settings.agent
-        ].split(",")[0]
-
         req = requests.get(
             self.tracker_url,
             params=http_params,
             proxies=self.settings.proxies,
-            headers=http_agent_headers,
+            headers=self.get_http_headers(),
             timeout=10,
         )
 
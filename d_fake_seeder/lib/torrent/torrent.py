@@ -1,13 +1,15 @@
+import functools
 import random
 import threading
 import time
 
 import gi
-from lib.logger import logger
+from lib.logger import DEBUG_ENABLED, logger
 from lib.settings import Settings
 from lib.torrent.file import File
-from lib.torrent.model.attributes import Attributes
+from lib.torrent.model.attributes import ATTRIBUTE_NAMES, Attributes
 from lib.torrent.seeder import Seeder
+from lib.util.helpers import connect_weak
 from lib.view import View
 
 gi.require_version("Gdk", "4.0")
@@ -15,6 +17,32 @@ gi.require_version("Gtk", "4.0")
 
 from gi.repository import GLib, GObject  # noqa
 
+# Attribute names stored on the Attributes object rather than the torrent
+ATTRIBUTE_SET = frozenset(ATTRIBUTE_NAMES)
+
+# Marks a failed attribute lookup, None is a valid attribute value
+MISSING = object()
+
+# Notification shown when the workers stop or start, indexed by the new state
+WORKER_MESSAGES = ("Stopping fake seeder %s", "Starting fake seeder %s")
+
+
+def log_errors(func):
+    # Log any exception escaping a worker instead of wrapping each body
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return func(self, *args, **kwargs)
+        except Exception:
+            logger.error(
+                "%s failed",
+                func.__name__,
+                exc_info=True,
+                extra={"class_name": self.__class__.__name__},
+            )
+
+    return wrapper
+
 
 # Torrent class definition
 class Torrent(GObject.GObject):
@@ -28,6 +56,31 @@ class Torrent(GObject.GObject):
         )
     }
 
+    # Starting values of a newly added torrent
+    DEFAULT_ATTRIBUTES = {
+        "active": True,
+        "name": "",
+        "progress": 0.0,
+        "uploading": False,
+        "total_uploaded": 0,
+        "total_downloaded": 0,
+        "session_uploaded": 0,
+        "session_downloaded": 0,
+        "seeders": 0,
+        "leechers": 0,
+        "small_torrent_limit": 0,
+        "total_size": 0,
+    }
+
+    # Attributes of a newly added torrent seeded from the global settings
+    SETTINGS_ATTRIBUTES = (
+        ("upload_speed", "upload_speed"),
+        ("download_speed", "download_speed"),
+        ("announce_interval", "announce_interval"),
+        ("next_update", "announce_interval"),
+        ("threshold", "threshold"),
+    )
+
     def __init__(self, filepath):
         super().__init__()
         logger.info(
@@ -36,49 +89,27 @@ class Torrent(GObject.GObject):
 
         self.torrent_attributes = Attributes()
 
-        # subscribe to settings changed
+        # subscribe to settings changed, the settings singleton outlives
+        # torrents so it must not hold removed ones alive
         self.settings = Settings.get_instance()
-        self.settings.connect("attribute-changed", self.handle_settings_changed)
+        connect_weak(self.settings, "attribute-changed", self.handle_settings_changed)
 
         self.file_path = filepath
 
         if self.file_path not in self.settings.torrents:
-            self.settings.torrents[self.file_path] = {
-                "active": True,
-                "id": (
-                    len(self.settings.torrents) + 1
-                    if len(self.settings.torrents) > 0
-                    else 1
-                ),
-                "name": "",
-                "upload_speed": self.settings.upload_speed,
-                "download_speed": self.settings.download_speed,
-                "progress": 0.0,
-                "announce_interval": self.settings.announce_interval,
-                "next_update": self.settings.announce_interval,
-                "uploading": False,
-                "total_uploaded": 0,
-                "total_downloaded": 0,
-                "session_uploaded": 0,
-                "session_downloaded": 0,
-                "seeders": 0,
-                "leechers": 0,
-                "threshold": self.settings.threshold,
-                "filepath": self.file_path,
-                "small_torrent_limit": 0,
-                "total_size": 0,
-            }
+            settings = self.settings
+            torrent_settings = dict(self.DEFAULT_ATTRIBUTES)
+            for attr, key in self.SETTINGS_ATTRIBUTES:
+                torrent_settings[attr] = getattr(settings, key)
+            torrent_settings["id"] = len(settings.torrents) + 1
+            torrent_settings["filepath"] = self.file_path
+            settings.torrents[self.file_path] = torrent_settings
             self.settings.save_settings()
 
-        ATTRIBUTES = Attributes
-        attributes = [
-            prop.name.replace("-", "_") for prop in GObject.list_properties(ATTRIBUTES)
-        ]
-
         self.torrent_file = File(self.file_path)
         self.seeder = Seeder(self.torrent_file)
 
-        for attr in attributes:
+        for attr in ATTRIBUTE_NAMES:
             setattr(
                 self.torrent_attributes,
                 attr,
@@ -88,158 +119,161 @@ class Torrent(GObject.GObject):
         self.session_uploaded = 0
         self.session_downloaded = 0
 
-        # Start the thread to update the name
-        self.torrent_worker_stop_event = threading.Event()
-        self.torrent_worker = threading.Thread(target=self.update_torrent_worker)
-        self.torrent_worker.start()
-
-        # Start the thread to update the name
-        self.peers_worker_stop_event = threading.Event()
-        self.peers_worker = threading.Thread(target=self.peers_worker_update)
-        self.peers_worker.start()
+        # Serializes restarts, each one runs on its own background thread
+        self.worker_lock = threading.Lock()
+        # Set once stop() has joined the workers, later restarts are dropped
+        self.stopped = False
+        self.start_workers()
 
+    @log_errors
     def peers_worker_update(self):
         logger.info(
             "Peers worker",
             extra={"class_name": self.__class__.__name__},
         )
 
-        try:
-            fetched = False
-            count = 5
-
-            while fetched is False and count != 0:
-                logger.debug(
-                    "Requesting seeder information",
-                    extra={"class_name": self.__class__.__name__},
-                )
-                fetched = self.seeder.load_peers()
-                if fetched is False:
-                    print("sleeping 3")
-                    time.sleep(3)
-                    count -= 1
-                    if count == 0:
-                        self.active = False
-
-        except Exception as e:
-            print(e)
+        fetched = False
+        count = 5
 
+        while fetched is False and count != 0:
+            logger.debug(
+                "Requesting seeder information",
+                extra={"class_name": self.__class__.__name__},
+            )
+            fetched = self.seeder.load_peers()
+            if fetched is False:
+                print("sleeping 3")
+                time.sleep(3)
+                count -= 1
+                if count == 0:
+                    self.active = False
+
+    @log_errors
     def update_torrent_worker(self):
         logger.info(
             "Torrent update worker",
             extra={"class_name": self.__class__.__name__},
         )
 
-        try:
-            ticker = 0.0
-
-            while not self.torrent_worker_stop_event.is_set():
-                if ticker == self.settings.tickspeed and self.active:
-                    GLib.idle_add(self.update_torrent_callback)
-                if ticker == self.settings.tickspeed:
-                    ticker = 0.0
-                ticker += 0.5
-                time.sleep(0.5)
+        ticker = 0.0
 
-        except Exception as e:
-            print(e)
+        while not self.torrent_worker_stop_event.is_set():
+            if ticker == self.settings.tickspeed and self.active:
+                GLib.idle_add(self.update_torrent_callback)
+            if ticker == self.settings.tickspeed:
+                ticker = 0.0
+            ticker += 0.5
+            time.sleep(0.5)
 
     def update_torrent_callback(self):
-        logger.debug(
-            "Torrent torrent update callback",
-            extra={"class_name": self.__class__.__name__},
-        )
-
-        update_internal = int(self.settings.tickspeed)
+        if DEBUG_ENABLED:
+            logger.debug(
+                "Torrent torrent update callback",
+                extra={"class_name": self.__class__.__name__},
+            )
 
-        if self.name != self.torrent_file.name:
-            self.name = self.torrent_file.name
+        # Read the settings once, every access goes through Settings.__getattr__
+        settings = self.settings
+        update_internal = int(settings.tickspeed)
+        torrent_settings = settings.torrents[self.file_path]
 
-        if self.total_size != self.torrent_file.total_size:
-            self.total_size = self.torrent_file.total_size
+        # Hold back the property notifications until the tick is applied, bound
+        # widgets then refresh once per property instead of once per write
+        with self.torrent_attributes.freeze_notify():
+            if self.name != self.torrent_file.name:
+                self.name = self.torrent_file.name
 
-        if self.seeder.ready:
-            if self.seeders != self.seeder.seeders:
-                self.seeders = self.seeder.seeders
+            if self.total_size != self.torrent_file.total_size:
+                self.total_size = self.torrent_file.total_size
 
-            if self.leechers != self.seeder.leechers:
-                self.leechers = self.seeder.leechers
+            if self.seeder.ready:
+                if self.seeders != self.seeder.seeders:
+                    self.seeders = self.seeder.seeders
 
-        threshold = (
-            self.settings.torrents[self.file_path]["threshold"]
-            if "threshold" in self.settings.torrents[self.file_path]
-            else self.settings.threshold
-        )
+                if self.leechers != self.seeder.leechers:
+                    self.leechers = self.seeder.leechers
 
-        if self.threshold != threshold:
-            self.threshold = threshold
-
-        if self.progress >= (threshold / 100) and not self.uploading:
-            if self.uploading is False:
-                self.uploading = True
-
-        if self.uploading:
-            upload_factor = int(random.uniform(0.200, 0.800) * 1000)
-            next_speed = self.upload_speed * 1024 * upload_factor
-            next_speed *= update_internal
-            next_speed /= 1000
-            self.session_uploaded += int(next_speed)
-            self.total_uploaded += self.session_uploaded
-
-        if self.progress < 1.0:
-            download_factor = int(random.uniform(0.200, 0.800) * 1000)
-            next_speed = self.download_speed * 1024 * download_factor
-            next_speed *= update_internal
-            next_speed /= 1000
-            self.session_downloaded += int(next_speed)
-            self.total_downloaded += int(next_speed)
-
-            if self.total_downloaded >= self.total_size:
-                self.progress = 1.0
-            else:
-                self.progress = self.total_downloaded / self.total_size
-
-        if self.next_update > 0:
-            update = self.next_update - int(self.settings.tickspeed)
-            self.next_update = update if update > 0 else 0
-
-        if self.next_update <= 0:
-            self.next_update = self.announce_interval
-            # announce
-            download_left = (
-                self.total_size - self.total_downloaded
-                if self.total_size - self.total_downloaded > 0
-                else 0
-            )
-            self.seeder.upload(
-                self.session_uploaded,
-                self.session_downloaded,
-                download_left,
+            threshold = (
+                torrent_settings["threshold"]
+                if "threshold" in torrent_settings
+                else settings.threshold
             )
 
+            if self.threshold != threshold:
+                self.threshold = threshold
+
+            if self.progress >= (threshold / 100) and not self.uploading:
+                if self.uploading is False:
+                    self.uploading = True
+
+            if self.uploading:
+                upload_factor = int(random.uniform(0.200, 0.800) * 1000)
+                next_speed = self.upload_speed * 1024 * upload_factor
+                next_speed *= update_internal
+                next_speed /= 1000
+                self.session_uploaded += int(next_speed)
+                self.total_uploaded += self.session_uploaded
+
+            if self.progress < 1.0:
+                download_factor = int(random.uniform(0.200, 0.800) * 1000)
+                next_speed = self.download_speed * 1024 * download_factor
+                next_speed *= update_internal
+                next_speed /= 1000
+                self.session_downloaded += int(next_speed)
+                self.total_downloaded += int(next_speed)
+
+                # Truncate to a tenth of a percent, the bound progress bars
+                # only redraw when the shown value actually moves
+                if self.total_downloaded >= self.total_size:
+                    progress = 1.0
+                else:
+                    progress = (
+                        int(self.total_downloaded * 1000 / self.total_size) / 1000
+                    )
+                if self.progress != progress:
+                    self.progress = progress
+
+            if self.next_update > 0:
+                update = self.next_update - update_internal
+                self.next_update = update if update > 0 else 0
+
+            if self.next_update <= 0:
+                self.next_update = self.announce_interval
+                # announce
+                download_left = (
+                    self.total_size - self.total_downloaded
+                    if self.total_size - self.total_downloaded > 0
+                    else 0
+                )
+                self.seeder.upload(
+                    self.session_uploaded,
+                    self.session_downloaded,
+                    download_left,
+                )
+
         self.emit("attribute-changed", None, None)
 
     def stop(self):
         logger.info("Torrent stop", extra={"class_name": self.__class__.__name__})
         # Stop the name update thread
         logger.info(
-            "Torrent Stopping fake seeder: " + self.name,
+            "Torrent Stopping fake seeder: %s",
+            self.name,
             extra={"class_name": self.__class__.__name__},
         )
-        View.instance.notify("Stopping fake seeder " + self.name)
-        self.torrent_worker_stop_event.set()
-        self.torrent_worker.join()
+        View.instance.notify(WORKER_MESSAGES[False] % self.name)
+        # Wait for a restart in flight so the workers joined are the live ones
+        with self.worker_lock:
+            self.stopped = True
+            self.torrent_worker_stop_event.set()
+            self.torrent_worker.join()
 
-        # Start the thread to update the name
-        self.peers_worker_stop_event.set()
-        self.peers_worker.join()
+            # Start the thread to update the name
+            self.peers_worker_stop_event.set()
+            self.peers_worker.join()
 
-        ATTRIBUTES = Attributes
-        attributes = [
-            prop.name.replace("-", "_") for prop in GObject.list_properties(ATTRIBUTES)
-        ]
         self.settings.torrents[self.file_path] = {
-            attr: getattr(self, attr) for attr in attributes
+            attr: getattr(self, attr) for attr in ATTRIBUTE_NAMES
         }
 
     def get_seeder(self):
@@ -259,36 +293,49 @@ class Torrent(GObject.GObject):
         )
         # print(key + " = " + value)
 
-    def restart_worker(self, state):
+    def restart_worker(self):
         logger.info(
             "Torrent restart worker",
             extra={"class_name": self.__class__.__name__},
         )
-        try:
-            View.instance.notify("Stopping fake seeder " + self.name)
-            self.torrent_worker_stop_event.set()
-            self.torrent_worker.join()
+        # Joining the workers waits out a peers request or retry sleep, do it
+        # off the main loop so toggling a torrent never freezes the window
+        threading.Thread(target=self.restart_worker_thread, daemon=True).start()
+
+    def restart_worker_thread(self):
+        # Threads may take the lock in any order, so each one applies the
+        # active state current at that point rather than the one that queued it
+        with self.worker_lock:
+            if self.stopped:
+                return
+
+            if not self.torrent_worker_stop_event.is_set():
+                self.stop_workers()
+
+            if self.active:
+                GLib.idle_add(View.instance.notify, WORKER_MESSAGES[True] % self.name)
+                self.start_workers()
+
+    @log_errors
+    def stop_workers(self):
+        GLib.idle_add(View.instance.notify, WORKER_MESSAGES[False] % self.name)
+        self.torrent_worker_stop_event.set()
+        self.torrent_worker.join()
 
-            self.peers_worker_stop_event.set()
-            self.peers_worker.join()
-        except Exception as e:
-            print(e)
-
-        if state:
-            try:
-                View.instance.notify("Starting fake seeder " + self.name)
-                self.torrent_worker_stop_event = threading.Event()
-                self.torrent_worker = threading.Thread(
-                    target=self.update_torrent_worker
-                )
-                self.torrent_worker.start()
+        self.peers_worker_stop_event.set()
+        self.peers_worker.join()
+
+    @log_errors
+    def start_workers(self):
+        # Start the thread to update the name
+        self.torrent_worker_stop_event = threading.Event()
+        self.torrent_worker = threading.Thread(target=self.update_torrent_worker)
+        self.torrent_worker.start()
 
-                # Start the thread to update the name
-                self.peers_worker_stop_event = threading.Event()
-                self.peers_worker = threading.Thread(target=self.peers_worker_update)
-                self.peers_worker.start()
-            except Exception as e:
-                print(e)
+        # Start the thread to update the name
+        self.peers_worker_stop_event = threading.Event()
+        self.peers_worker = threading.Thread(target=self.peers_worker_update)
+        self.peers_worker.start()
 
     def get_attributes(self):
         return self.torrent_attributes
@@ -300,10 +347,10 @@ class Torrent(GObject.GObject):
         if attr == "torrent_attributes":
             self.torrent_attributes = Attributes()
             return self.torrent_attributes
-        elif hasattr(self.torrent_attributes, attr):
-            return getattr(self.torrent_attributes, attr)
-        elif hasattr(self, attr):
-            return getattr(self, attr)
+        # A single lookup on the attributes object, not a hasattr probe first
+        value = getattr(self.torrent_attributes, attr, MISSING)
+        if value is not MISSING:
+            return value
         raise AttributeError(
             f"'{self.__class__.__name__}' object has no attribute '{attr}'"
         )
@@ -311,9 +358,9 @@ class Torrent(GObject.GObject):
     def __setattr__(self, attr, value):
         if attr == "torrent_attributes":
             self.__dict__["torrent_attributes"] = value
-        elif hasattr(self.torrent_attributes, attr):
+        elif attr in ATTRIBUTE_SET:
             setattr(self.torrent_attributes, attr, value)
             if attr == "active":
-                self.restart_worker(value)
+                self.restart_worker()
         else:
             super().__setattr__(attr, value)
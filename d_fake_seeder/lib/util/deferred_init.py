@@ -0,0 +1,43 @@
+import time
+from collections import deque
+
+from gi.repository import GLib
+from lib.logger import logger
+
+# Time a single idle dispatch may spend on queued work before yielding
+BUDGET_SECONDS = 0.004
+
+pending = deque()
+source_id = 0
+
+
+def schedule(func, *args):
+    """Run func(*args) after startup, sharing one low priority idle source."""
+    global source_id
+    pending.append((func, args))
+    if source_id == 0:
+        source_id = GLib.idle_add(run_pending, priority=GLib.PRIORITY_LOW)
+
+
+def run_pending():
+    """Drain queued callables in order until the time budget is used up."""
+    global source_id
+    deadline = time.monotonic() + BUDGET_SECONDS
+    while pending:
+        func, args = pending.popleft()
+        # One failing callable must not strand the rest of the queue
+        try:
+            func(*args)
+        except Exception:
+            logger.error(
+                "%s failed",
+                func.__name__,
+                exc_info=True,
+                extra={"class_name": "DeferredInit"},
+            )
+        if time.monotonic() >= deadline:
+            break
+    if pending:
+        return True
+    source_id = 0
+    return False
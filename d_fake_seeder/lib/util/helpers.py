@@ -1,5 +1,16 @@
+import functools
 import random
 import string
+import weakref
+
+# Display formatters are called for every cell and label each tick with values
+# that mostly repeat, they keep their recent results. typed keeps 1 and 1.0
+# apart as they format differently
+format_cache = functools.lru_cache(maxsize=4096, typed=True)
+
+# Units of humanbytes and the divisor of each, every unit is 1024 of the last
+HUMANBYTES_UNITS = ("B", "KB", "MB", "GB", "TB")
+HUMANBYTES_SCALES = tuple(1 << (10 * index) for index in range(len(HUMANBYTES_UNITS)))
 
 
 def sizeof_fmt(num, suffix="B"):
@@ -30,44 +41,29 @@ def random_id(length):
     return "".join(random.choices(string.ascii_letters + string.digits, k=length))
 
 
+@format_cache
 def humanbytes(B):
     """Return the given bytes as a human friendly KB, MB, GB, or TB string."""
     B = float(B)
-    KB = float(1024)
-    MB = float(KB**2)  # 1,048,576
-    GB = float(KB**3)  # 1,073,741,824
-    TB = float(KB**4)  # 1,099,511,627,776
-
-    if B < KB:
-        return "{0} {1}".format(
-            int(B) if B.is_integer() else B, "B" if 0 == B > 1 else "B"
-        )
-    elif KB <= B < MB:
-        return "{0} KB".format(
-            int(B / KB)
-            if (B / KB).is_integer()
-            else "{0:.2f}".format(B / KB).rstrip("0").rstrip(".")
-        )
-    elif MB <= B < GB:
-        return "{0} MB".format(
-            int(B / MB)
-            if (B / MB).is_integer()
-            else "{0:.2f}".format(B / MB).rstrip("0").rstrip(".")
-        )
-    elif GB <= B < TB:
-        return "{0} GB".format(
-            int(B / GB)
-            if (B / GB).is_integer()
-            else "{0:.2f}".format(B / GB).rstrip("0").rstrip(".")
-        )
-    elif TB <= B:
-        return "{0} TB".format(
-            int(B / TB)
-            if (B / TB).is_integer()
-            else "{0:.2f}".format(B / TB).rstrip("0").rstrip(".")
-        )
+
+    if B < 1024:
+        return "{0} B".format(int(B) if B.is_integer() else B)
+
+    # Each unit is ten more bits, the bit length picks it without a compare
+    # chain
+    index = min((int(B).bit_length() - 1) // 10, len(HUMANBYTES_UNITS) - 1)
+    value = B / HUMANBYTES_SCALES[index]
+    return "{0} {1}".format(
+        (
+            int(value)
+            if value.is_integer()
+            else "{0:.2f}".format(value).rstrip("0").rstrip(".")
+        ),
+        HUMANBYTES_UNITS[index],
+    )
 
 
+@format_cache
 def convert_seconds_to_hours_mins_seconds(seconds):
     hours = seconds // 3600
     remaining_seconds = seconds % 3600
@@ -85,9 +81,27 @@ def convert_seconds_to_hours_mins_seconds(seconds):
     return time_str
 
 
+@format_cache
 def add_kb(kb):
     return "{} kb".format(str(kb))
 
 
+@format_cache
 def add_percent(percent):
     return "{} %".format(str(percent))
+
+
+def connect_weak(source, signal, method):
+    """Connect a bound method to a signal without keeping its object alive."""
+    method_ref = weakref.WeakMethod(method)
+
+    def handler(*args):
+        callback = method_ref()
+        if callback is None:
+            # The receiver is gone, drop the connection on its next emission
+            source.disconnect(handler_id)
+            return None
+        return callback(*args)
+
+    handler_id = source.connect(signal, handler)
+    return handler_id
@@ -28,6 +28,26 @@ class View:
     torrents_columnview = None
     torrents_states = None
 
+    SPLASH_FADE_SECONDS = 3.0
+
+    # Keep theme decorations off the overlay widgets, they are composited over
+    # the whole window and the splash is repainted every frame while it fades
+    OVERLAY_CSS = (
+        b".overlay-widget {"
+        b" border-radius: 0; box-shadow: none; transition: none;"
+        b" }"
+    )
+
+    # Attribute name and builder id of the widgets the view works with
+    BUILDER_OBJECTS = (
+        ("quit_menu_item", "quit_menu_item"),
+        ("help_menu_item", "help_menu_item"),
+        ("overlay", "overlay"),
+        ("status", "status_label"),
+        ("main_paned", "main_paned"),
+        ("paned", "paned"),
+    )
+
     def __init__(self, app):
         logger.info("View instantiate", extra={"class_name": self.__class__.__name__})
         self.app = app
@@ -54,27 +74,33 @@ class View:
         self.notebook = Notebook(self.builder, None)
         self.states = States(self.builder, None)
         self.statusbar = Statusbar(self.builder, None)
+        self.components = (
+            self.torrents,
+            self.notebook,
+            self.states,
+            self.statusbar,
+            self.toolbar,
+        )
 
         # Getting relevant objects
-        self.quit_menu_item = self.builder.get_object("quit_menu_item")
-        self.help_menu_item = self.builder.get_object("help_menu_item")
-        self.overlay = self.builder.get_object("overlay")
-        self.status = self.builder.get_object("status_label")
-        self.main_paned = self.builder.get_object("main_paned")
-        self.paned = self.builder.get_object("paned")
+        get = self.builder.get_object
+        for attribute, builder_id in self.BUILDER_OBJECTS:
+            setattr(self, attribute, get(builder_id))
         self.current_time = time.time()
 
         # notification overlay
         self.notify_label = Gtk.Label(label="Overlayed Button")
         # self.notify_label.set_no_show_all(True)
         self.notify_label.set_visible(False)
-        self.notify_label.hide()
         self.notify_label.set_valign(Gtk.Align.CENTER)
         self.notify_label.set_halign(Gtk.Align.CENTER)
+        self.notify_label.add_css_class("overlay-widget")
         self.overlay.add_overlay(self.notify_label)
+        self.timeout_id = 0
 
         self.setup_window()
-        self.show_splash_image()
+        # Decode and attach the splash once the window has been presented
+        GLib.idle_add(self.show_splash_image, priority=GLib.PRIORITY_HIGH_IDLE)
         GLib.timeout_add_seconds(1.0, self.resize_panes)
 
     def setup_window(self):
@@ -91,6 +117,15 @@ class View:
             css_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
         )
 
+        # Overlay styling has to reach the children, so it goes on the display
+        overlay_provider = Gtk.CssProvider()
+        overlay_provider.load_from_data(self.OVERLAY_CSS, -1)
+        Gtk.StyleContext.add_provider_for_display(
+            self.window.get_display(),
+            overlay_provider,
+            Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION,
+        )
+
         # Create an action group
         self.action_group = Gio.SimpleActionGroup()
 
@@ -136,13 +171,13 @@ class View:
             os.environ.get("DFS_PATH") + "/images/dfakeseeder.png"
         )
         # self.splash_image.set_no_show_all(False)
-        self.splash_image.set_visible(True)
-        self.splash_image.show()
         self.splash_image.set_valign(Gtk.Align.CENTER)
         self.splash_image.set_halign(Gtk.Align.CENTER)
         self.splash_image.set_size_request(100, 100)
+        self.splash_image.add_css_class("overlay-widget")
         self.overlay.add_overlay(self.splash_image)
         GLib.timeout_add_seconds(2, self.fade_out_image)
+        return False
 
     def show_about(self, action, param):
         self.window.about = Gtk.AboutDialog()
@@ -165,13 +200,21 @@ class View:
         self.window.about.show()
 
     def fade_out_image(self):
-        self.splash_image.fade_out = 1.0
-        GLib.timeout_add(75, self.fade_image)
-
-    def fade_image(self):
-        self.splash_image.fade_out -= 0.025
-        if self.splash_image.fade_out > 0:
-            self.splash_image.set_opacity(self.splash_image.fade_out)
+        # Step the fade on the frame clock, it only ticks while the splash is
+        # painted and stops with the callback
+        self.fade_start = None
+        self.splash_image.add_tick_callback(self.fade_image)
+
+    def fade_image(self, widget, frame_clock):
+        # Opacity follows the elapsed time, so a busy main loop drops steps
+        # rather than stretching the fade out
+        frame_time = frame_clock.get_frame_time() / 1000000
+        if self.fade_start is None:
+            self.fade_start = frame_time
+        elapsed = frame_time - self.fade_start
+        opacity = 1.0 - elapsed / self.SPLASH_FADE_SECONDS
+        if opacity > 0:
+            self.splash_image.set_opacity(opacity)
             return True
         else:
             self.splash_image.hide()
@@ -195,28 +238,33 @@ class View:
     def notify(self, text):
         logger.info("View notify", extra={"class_name": self.__class__.__name__})
         # Cancel the previous timeout, if it exists
-        if hasattr(self, "timeout_id") and self.timeout_id > 0:
+        if self.timeout_id > 0:
             GLib.source_remove(self.timeout_id)
 
         # self.notify_label.set_no_show_all(False)
-        self.notify_label.set_visible(True)
-        self.notify_label.show()
-        self.notify_label.set_text(text)
-        self.status.set_text(text)
-        self.timeout_id = GLib.timeout_add(
-            3000,
-            lambda: self.notify_label.set_visible(False) or self.notify_label.hide(),
-        )
+        # Back to back notifications find the label already shown, skip the
+        # redundant visibility change
+        if not self.notify_label.get_visible():
+            self.notify_label.set_visible(True)
+        # Repeated messages keep the labels' text, skip the relayout
+        if self.notify_label.get_text() != text:
+            self.notify_label.set_text(text)
+        if self.status.get_text() != text:
+            self.status.set_text(text)
+        self.timeout_id = GLib.timeout_add(3000, self.hide_notify_label)
+
+    def hide_notify_label(self):
+        self.notify_label.set_visible(False)
+        # The source is gone once this returns, do not remove it again later
+        self.timeout_id = 0
+        return False
 
     # Setting model for the view
     def set_model(self, model):
         logger.info("View set model", extra={"class_name": self.__class__.__name__})
         self.model = model
-        self.notebook.set_model(model)
-        self.toolbar.set_model(model)
-        self.torrents.set_model(model)
-        self.states.set_model(model)
-        self.statusbar.set_model(model)
+        for component in self.components:
+            component.set_model(model)
 
     # Connecting signals for different events
     def connect_signals(self):
@@ -226,25 +274,16 @@ class View:
         )
         self.window.connect("destroy", self.quit)
         self.window.connect("close-request", self.quit)
-        self.model.connect("data-changed", self.torrents.update_view)
-        self.model.connect("data-changed", self.notebook.update_view)
-        self.model.connect("data-changed", self.states.update_view)
-        self.model.connect("data-changed", self.statusbar.update_view)
-        self.model.connect("data-changed", self.toolbar.update_view)
-        self.model.connect("selection-changed", self.torrents.model_selection_changed)
-        self.model.connect("selection-changed", self.notebook.model_selection_changed)
-        self.model.connect("selection-changed", self.states.model_selection_changed)
-        self.model.connect("selection-changed", self.statusbar.model_selection_changed)
-        self.model.connect("selection-changed", self.toolbar.model_selection_changed)
+        for component in self.components:
+            self.model.connect("data-changed", component.update_view)
+            self.model.connect("selection-changed", component.model_selection_changed)
         signal.signal(signal.SIGINT, self.quit)
 
     # Connecting signals for different events
     def remove_signals(self):
         logger.info("Remove signals", extra={"class_name": self.__class__.__name__})
-        self.model.disconnect_by_func(self.torrents.update_view)
-        self.model.disconnect_by_func(self.notebook.update_view)
-        self.model.disconnect_by_func(self.states.update_view)
-        self.model.disconnect_by_func(self.statusbar.update_view)
+        for component in self.components:
+            self.model.disconnect_by_func(component.update_view)
 
     # Event handler for clicking on quit
     def on_quit_clicked(self, menu_item):